@@ -0,0 +1,131 @@
+import os
+import asyncio
+import threading
+
+# Admission limits (overridable through the environment)
+MAX_UPLOAD_MB = float(os.environ.get('MAX_UPLOAD_MB', 10))
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+MAX_PDF_PAGES = int(os.environ.get('MAX_PDF_PAGES', 30))
+MAX_CONCURRENT_PREDICTIONS = int(os.environ.get('MAX_CONCURRENT_PREDICTIONS', os.cpu_count() or 1))
+ADMISSION_QUEUE_SIZE = int(os.environ.get('ADMISSION_QUEUE_SIZE', 2 * MAX_CONCURRENT_PREDICTIONS))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 2.0))
+RETRY_AFTER_SECONDS = int(os.environ.get('RETRY_AFTER_SECONDS', 5))
+
+
+class DocumentTooLargeError(ValueError):
+    """Raised when an uploaded document exceeds the page limit"""
+
+
+class AdmissionController:
+    """Bounded concurrency with a short wait queue for /predict
+
+    Up to ``max_concurrent`` requests run at once. Up to ``queue_size`` more
+    wait at most ``queue_timeout`` seconds for a slot; anything beyond that is
+    rejected immediately so callers can answer 503 instead of piling up.
+    """
+
+    def __init__(self, max_concurrent, queue_size, queue_timeout):
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._active = 0
+        self.counters = {
+            'admitted': 0,
+            'rejected_queue_full': 0,
+            'rejected_queue_timeout': 0,
+            'rejected_too_large': 0,
+            'rejected_too_many_pages': 0,
+        }
+
+    def acquire(self):
+        """Try to take a slot, returning False if the request should be shed"""
+        if self._slots.acquire(blocking=False):
+            return self._admit()
+
+        with self._lock:
+            if self._waiting >= self.queue_size:
+                self.counters['rejected_queue_full'] += 1
+                return False
+            self._waiting += 1
+
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if not acquired:
+            self.record_rejection('rejected_queue_timeout')
+            return False
+        return self._admit()
+
+    def _admit(self):
+        with self._lock:
+            self._active += 1
+            self.counters['admitted'] += 1
+        return True
+
+    def release(self):
+        """Give back a slot taken by acquire()"""
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def record_rejection(self, reason):
+        """Count a request rejected for the given reason"""
+        with self._lock:
+            self.counters[reason] += 1
+
+    def stats(self):
+        """Snapshot of limits, current load and rejection counters"""
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'queue_size': self.queue_size,
+                'active': self._active,
+                'waiting': self._waiting,
+                **self.counters,
+            }
+
+
+class AsyncAdmissionController(AdmissionController):
+    """AdmissionController for the event loop
+
+    Queued requests wait on an asyncio semaphore instead of blocking an
+    executor thread, so waiters never take threads from admitted requests.
+    acquire() and release() must be called from the event loop.
+    """
+
+    def __init__(self, max_concurrent, queue_size, queue_timeout):
+        super().__init__(max_concurrent, queue_size, queue_timeout)
+        self._slots = asyncio.BoundedSemaphore(max_concurrent)
+
+    async def acquire(self):
+        """Try to take a slot, returning False if the request should be shed"""
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return self._admit()
+
+        with self._lock:
+            if self._waiting >= self.queue_size:
+                self.counters['rejected_queue_full'] += 1
+                return False
+            self._waiting += 1
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.record_rejection('rejected_queue_timeout')
+            return False
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        return self._admit()
+
+
+predict_admission = AdmissionController(
+    MAX_CONCURRENT_PREDICTIONS, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT
+)
@@ -1,22 +1,68 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, url_for, send_from_directory, abort
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import gzip
+import json
+import hashlib
+import uuid
+import threading
 import joblib
 import numpy as np
 import re
 import nltk
 from nltk.corpus import stopwords
-import PyPDF2
-import docx
+
+from admission import (
+    MAX_UPLOAD_BYTES, MAX_UPLOAD_MB, RETRY_AFTER_SECONDS,
+    DocumentTooLargeError, predict_admission,
+)
+from cascade import TARGET_AGREEMENT, first_stage_scores, keyword_support, accept_first_stage, set_target_agreement
+from request_profiler import (
+    PROFILING_ENABLED, PROFILE_DIR, PROFILE_HEADER, META_FILE,
+    should_profile, run_profiled, capture_input, list_profiles, profile_exists, token_matches,
+)
+from extraction_pool import ExtractionError, ExtractionTimeoutError, extraction_pool
+from resume_store import RESUME_STORE_ENABLED, compute_model_version, file_content_hash, save_processed_resume
+from warmup import warmup_state
+from micro_batcher import MICRO_BATCH_ENABLED, MicroBatcher
+from text_extraction import (
+    extract_text_from_pdf, extract_text_from_docx, extract_text_from_txt, TEXT_EXTRACTORS,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
 
 # File paths
 MODEL_FILE = "logistic_model.pkl"
 VECTORIZER_FILE = "tfidf_vectorizer.pkl"
 ENCODER_FILE = "label_encoder.pkl"
+FAST_MODEL_FILE = "fast_model.pkl"
 UPLOAD_FOLDER = "uploads"
+ASSET_FOLDER = os.path.join("static", "dist")
+ASSET_MANIFEST_FILE = os.path.join(ASSET_FOLDER, "manifest.json")
+ASSET_MAX_AGE = 31536000
+MIN_RESUME_TEXT_LENGTH = 50
+
+# Cascaded inference: answer from the cheap first stage when it is confident
+CASCADE_ENABLED = os.environ.get('CASCADE_ENABLED', '0') == '1'
+
+# Response compression settings
+COMPRESSION_MIN_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
 
 # Create uploads directory if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -25,7 +71,21 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 model = None
 tfidf_vectorizer = None
 label_encoder = None
+cascade_stage = None
+inference_batcher = None
+MODEL_VERSION = None
 STOP_WORDS = None
+CASCADE_STATS = {'first_stage': 0, 'escalated': 0}
+CASCADE_STATS_LOCK = threading.Lock()
+warmup_thread = None
+
+# Static per-role response fragments (filled by precompute_role_fragments)
+ROLE_JOB_LINKS = {}
+ROLE_INTERVIEW_QUESTIONS = {}
+ROLE_SKILL_SETS = {}
+
+# Fingerprinted static assets (filled by load_asset_manifest)
+ASSET_MANIFEST = {}
 
 # Job role skill sets for skill matching
 JOB_SKILLS = {
@@ -65,6 +125,12 @@ JOB_SKILLS = {
     'CONSULTANT': ['consulting', 'business analysis', 'strategy', 'project management', 'client management'],
 }
 
+# Compiled word-boundary patterns for every known skill
+SKILL_PATTERNS = {
+    skill: re.compile(r'\b' + re.escape(skill) + r'\b')
+    for skill in sorted({skill for skills_list in JOB_SKILLS.values() for skill in skills_list})
+}
+
 # Interview questions database by role
 INTERVIEW_QUESTIONS = {
     'Data Science': [
@@ -224,13 +290,9 @@ def download_nltk_data():
 def extract_skills(text):
     """Extract skills from resume text"""
     text_lower = text.lower()
-    all_skills = set()
-    for skills_list in JOB_SKILLS.values():
-        all_skills.update(skills_list)
-    
     found_skills = []
-    for skill in all_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
+    for skill, pattern in SKILL_PATTERNS.items():
+        if pattern.search(text_lower):
             found_skills.append(skill)
     
     return found_skills
@@ -241,7 +303,7 @@ def calculate_skill_match(resume_skills, job_category):
     if job_category not in JOB_SKILLS:
         return 0.0, [], []
     
-    required_skills = set(JOB_SKILLS[job_category])
+    required_skills = ROLE_SKILL_SETS.get(job_category) or frozenset(JOB_SKILLS[job_category])
     resume_skills_set = set(resume_skills)
     
     matched_skills = resume_skills_set.intersection(required_skills)
@@ -255,8 +317,8 @@ def calculate_skill_match(resume_skills, job_category):
     return match_percentage, list(matched_skills), list(missing_skills)
 
 
-def get_job_links(role):
-    """Get job application links for a specific role"""
+def build_job_links(role):
+    """Build job application links for a specific role"""
     role_encoded = role.replace(' ', '+')
     role_underscore = role.replace(' ', '-').lower()
     
@@ -295,9 +357,19 @@ def get_job_links(role):
     return links
 
 
+def get_job_links(role):
+    """Get job application links for a specific role"""
+    links = ROLE_JOB_LINKS.get(role)
+    if links is None:
+        links = build_job_links(role)
+    return links
+
+
 def get_interview_questions(role, resume_skills):
     """Generate interview questions based on role and resume skills"""
-    questions = INTERVIEW_QUESTIONS.get(role, INTERVIEW_QUESTIONS['default']).copy()
+    questions = ROLE_INTERVIEW_QUESTIONS.get(role)
+    if questions is None:
+        questions = INTERVIEW_QUESTIONS.get(role, INTERVIEW_QUESTIONS['default'])[:5]
     
     # Add skill-based questions
     skill_questions = []
@@ -314,10 +386,44 @@ def get_interview_questions(role, resume_skills):
         elif 'docker' in skill_lower or 'kubernetes' in skill_lower:
             skill_questions.append(f'How have you used {skill} in your projects?')
     
-    all_questions = questions[:5] + skill_questions[:3]
+    all_questions = questions + skill_questions[:3]
     return all_questions[:8]
 
 
+def precompute_role_fragments():
+    """Precompute the static per-role parts of the /predict response"""
+    ROLE_JOB_LINKS.clear()
+    ROLE_INTERVIEW_QUESTIONS.clear()
+    ROLE_SKILL_SETS.clear()
+    
+    for role in label_encoder.classes_:
+        role = str(role)
+        ROLE_JOB_LINKS[role] = build_job_links(role)
+        ROLE_INTERVIEW_QUESTIONS[role] = INTERVIEW_QUESTIONS.get(role, INTERVIEW_QUESTIONS['default'])[:5]
+        if role in JOB_SKILLS:
+            ROLE_SKILL_SETS[role] = frozenset(JOB_SKILLS[role])
+    
+    print(f"✓ Precomputed response fragments for {len(ROLE_JOB_LINKS)} roles")
+
+
+def json_response(payload, status=200):
+    """Serialize a payload with the fastest available JSON encoder"""
+    if orjson is not None:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def select_content_encoding():
+    """Pick the best response encoding the client accepts"""
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
 def select_best_fit_role(recommendations):
     """Select the best fit role based on combined confidence and skill match"""
     best_score = 0
@@ -346,34 +452,9 @@ def clean_text(text):
     return " ".join(words)
 
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
-    text = ""
-    with open(file_path, 'rb') as file:
-        pdf_reader = PyPDF2.PdfReader(file)
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-    return text
-
-
-def extract_text_from_docx(file_path):
-    """Extract text from DOCX file"""
-    doc = docx.Document(file_path)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
-
-
-def extract_text_from_txt(file_path):
-    """Extract text from TXT file"""
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-        return file.read()
-
-
 def load_models():
     """Load trained models"""
-    global model, tfidf_vectorizer, label_encoder
+    global model, tfidf_vectorizer, label_encoder, cascade_stage, inference_batcher, MODEL_VERSION
     
     if not os.path.exists(MODEL_FILE):
         raise FileNotFoundError(f"Model file '{MODEL_FILE}' not found. Please train the model first by running main.py")
@@ -388,11 +469,79 @@ def load_models():
     model = joblib.load(MODEL_FILE)
     tfidf_vectorizer = joblib.load(VECTORIZER_FILE)
     label_encoder = joblib.load(ENCODER_FILE)
+    MODEL_VERSION = compute_model_version(MODEL_FILE, VECTORIZER_FILE, ENCODER_FILE)
     
     print("✓ Models loaded successfully")
-    print(f"  - Model: Logistic Regression")
+    print(f"  - Model: Logistic Regression ({MODEL_VERSION})")
     print(f"  - Categories: {len(label_encoder.classes_)}")
     print(f"  - Features: {len(tfidf_vectorizer.vocabulary_)}")
+    
+    if CASCADE_ENABLED:
+        stage = joblib.load(FAST_MODEL_FILE) if os.path.exists(FAST_MODEL_FILE) else None
+        if stage is None or 'vectorizer' not in stage:
+            print(f"⚠️  Cascade disabled: '{FAST_MODEL_FILE}' is missing or outdated. Run main.py to build it")
+        else:
+            cascade_stage = stage
+            threshold = set_target_agreement(cascade_stage, TARGET_AGREEMENT)
+            print(f"  - Cascade: first stage enabled ({TARGET_AGREEMENT:.0%} target agreement, "
+                  f"margin threshold {threshold:.2f})")
+    
+    if MICRO_BATCH_ENABLED:
+        inference_batcher = MicroBatcher(predict_probabilities_batch)
+        print(f"  - Micro-batching: up to {inference_batcher.max_batch_size} requests "
+              f"or {inference_batcher.max_wait * 1000:g}ms per batch")
+    
+    precompute_role_fragments()
+
+
+def load_asset_manifest():
+    """Load the fingerprinted asset manifest written by build_static.py"""
+    global ASSET_MANIFEST
+    
+    if not os.path.exists(ASSET_MANIFEST_FILE):
+        print("⚠️  No asset manifest found, serving unfingerprinted static files (run build_static.py)")
+        ASSET_MANIFEST = {}
+        return
+    
+    with open(ASSET_MANIFEST_FILE, 'r') as file:
+        ASSET_MANIFEST = json.load(file)
+    print(f"✓ Asset manifest loaded ({len(ASSET_MANIFEST)} assets)")
+
+
+@app.context_processor
+def asset_helpers():
+    """Expose asset_url() to templates"""
+    def asset_url(filename):
+        hashed_name = ASSET_MANIFEST.get(filename)
+        if hashed_name is None:
+            return url_for('static', filename=filename)
+        return url_for('assets', filename=hashed_name)
+    return {'asset_url': asset_url}
+
+
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    """Serve fingerprinted assets with immutable caching and precompressed variants"""
+    if filename not in ASSET_MANIFEST.values():
+        abort(404)
+    
+    # Pick a precompressed variant written by build_static.py
+    encoding = None
+    served_name = filename
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[candidate] and os.path.exists(os.path.join(ASSET_FOLDER, filename + suffix)):
+            encoding = candidate
+            served_name = filename + suffix
+            break
+    
+    mimetype = 'text/css' if filename.endswith('.css') else 'application/javascript'
+    response = send_from_directory(ASSET_FOLDER, served_name, mimetype=mimetype, max_age=ASSET_MAX_AGE, etag=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 
 @app.route('/')
@@ -413,6 +562,214 @@ def resume_builder():
     return render_template('resume_builder.html')
 
 
+def overloaded_response():
+    """Fast 503 telling the client when to retry"""
+    response = jsonify({'error': 'Server is busy analyzing other resumes. Please retry shortly.'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+    return response
+
+
+def upload_too_large_response():
+    """Fast 413 for uploads over MAX_UPLOAD_MB"""
+    predict_admission.record_rejection('rejected_too_large')
+    return jsonify({'error': f'File too large. Maximum upload size is {MAX_UPLOAD_MB:g}MB'}), 413
+
+
+def get_file_extension(filename):
+    """Return the lowercased extension of an uploaded filename"""
+    if '.' not in filename:
+        return ''
+    return filename.rsplit('.', 1)[1].lower()
+
+
+def predict_probabilities_batch(cleaned_texts):
+    """Vectorize a batch of cleaned resume texts and return one probability row per text"""
+    features = tfidf_vectorizer.transform(cleaned_texts)
+    return model.predict_proba(features)
+
+
+def predict_probabilities(cleaned_text):
+    """Vectorize cleaned resume text and return class probabilities"""
+    if inference_batcher is not None:
+        # Share one vectorize + predict call with concurrent requests
+        return inference_batcher.predict(cleaned_text)
+    return predict_probabilities_batch([cleaned_text])[0]
+
+
+def first_stage_probabilities(cleaned_text, resume_skills, count=True):
+    """Class probabilities from the cascade first stage, or None to escalate"""
+    probabilities, margin = first_stage_scores(cascade_stage, [cleaned_text], len(label_encoder.classes_))
+    support = keyword_support(
+        [probabilities[0].argmax()], [set(resume_skills)], label_encoder.classes_, ROLE_SKILL_SETS
+    )
+    accepted = accept_first_stage(cascade_stage, margin, support)[0]
+    if count:
+        with CASCADE_STATS_LOCK:
+            CASCADE_STATS['first_stage' if accepted else 'escalated'] += 1
+    return probabilities[0] if accepted else None
+
+
+def cascade_stats():
+    """Snapshot of first-stage and escalation counts"""
+    with CASCADE_STATS_LOCK:
+        return dict(CASCADE_STATS)
+
+
+def build_prediction_response(resume_skills, probabilities):
+    """Assemble the /predict response from class probabilities and resume skills"""
+    # Get top 3 predictions
+    top_3_idx = np.argsort(probabilities)[-3:][::-1]
+    top_3_categories = label_encoder.inverse_transform(top_3_idx)
+    top_3_probabilities = probabilities[top_3_idx]
+    
+    # Prepare top 3 recommendations with skill matching
+    recommendations = []
+    for cat, prob in zip(top_3_categories, top_3_probabilities):
+        match_pct, matched_skills, missing_skills = calculate_skill_match(resume_skills, cat)
+    
+        recommendations.append({
+            'role': cat,
+            'confidence': float(prob),
+            'skill_match': float(match_pct),
+            'matched_skills': matched_skills[:5],  # Top 5 matched skills
+            'missing_skills': missing_skills[:5] if len(recommendations) == 0 else []  # Only for top role
+        })
+    
+    # Select best fit role based on stats
+    best_fit, best_score = select_best_fit_role(recommendations)
+    
+    # Get job links for top 3 roles
+    job_opportunities = []
+    for rec in recommendations:
+        job_opportunities.append({
+            'role': rec['role'],
+            'links': get_job_links(rec['role'])
+        })
+    
+    # Generate interview questions for all top 3 roles
+    interview_questions_all = []
+    for rec in recommendations:
+        questions = get_interview_questions(rec['role'], resume_skills)
+        interview_questions_all.append({
+            'role': rec['role'],
+            'questions': questions
+        })
+    
+    # Prepare response with new features
+    response = {
+        'primary_role': recommendations[0]['role'],
+        'primary_confidence': recommendations[0]['confidence'],
+        'recommendations': recommendations,
+        'extracted_skills': resume_skills[:10],
+        'best_fit_role': {
+            'role': best_fit['role'],
+            'combined_score': float(best_score * 100),
+            'reason': f"Best match based on {int(best_fit['confidence']*100)}% confidence and {int(best_fit['skill_match'])}% skill match"
+        },
+        'job_opportunities': job_opportunities,
+        'interview_prep': interview_questions_all
+    }
+    
+    return response
+
+
+def preprocess_resume(resume_text):
+    """Skill extraction and text cleaning, returning (resume_skills, cleaned_text)"""
+    return extract_skills(resume_text), clean_text(resume_text)
+
+
+def analyze_resume(resume_text, content_hash=None, filename=None, warmup=False):
+    """Run skill extraction, classification and response assembly for resume text
+
+    With the resume store enabled and a content_hash given, the processed
+    resume and its prediction are recorded for later re-scoring. Warm-up
+    runs leave the cascade and micro-batching statistics untouched.
+    """
+    resume_skills, cleaned_text = preprocess_resume(resume_text)
+    return score_resume(resume_text, resume_skills, cleaned_text, content_hash, filename, warmup)
+
+
+def score_resume(resume_text, resume_skills, cleaned_text, content_hash=None, filename=None, warmup=False):
+    """Classify preprocessed resume text and assemble the /predict response"""
+    model_version = MODEL_VERSION
+    probabilities = None
+    if cascade_stage is not None:
+        # Accepted resumes skip the full model's vectorizer altogether
+        probabilities = first_stage_probabilities(cleaned_text, resume_skills, count=not warmup)
+        if probabilities is not None:
+            # First-stage answers are kept apart so a rescore replaces them with the full model's
+            model_version = f"{MODEL_VERSION}+cascade"
+    if probabilities is None and warmup:
+        probabilities = predict_probabilities_batch([cleaned_text])[0]
+    elif probabilities is None:
+        # Escalations share the batched call with other requests
+        probabilities = predict_probabilities(cleaned_text)
+    
+    response = build_prediction_response(resume_skills, probabilities)
+    
+    if RESUME_STORE_ENABLED and content_hash is not None:
+        try:
+            save_processed_resume(
+                content_hash, filename, resume_text, cleaned_text, resume_skills, model_version, response
+            )
+        except Exception as e:
+            # The analysis succeeded: a store failure must not turn it into an error
+            print(f"⚠️  Could not store resume {content_hash[:12]}: {type(e).__name__}: {e}")
+    
+    return response
+
+
+def extract_resume_text(file_path, file_extension, warmup=False):
+    """Extract text from a saved upload in the sandboxed pool, returning (text, error)
+
+    On failure text is None and error is the (payload, status) to send back.
+    Warm-up extractions are left out of the extraction pool's counters.
+    """
+    try:
+        resume_text = extraction_pool.extract(file_extension, file_path, count=not warmup)
+    except DocumentTooLargeError as e:
+        return None, ({'error': f'Document too large: {e}'}, 413)
+    except ExtractionTimeoutError:
+        return None, ({'error': 'Timed out extracting text from resume. The file may be malformed.'}, 422)
+    except ExtractionError as e:
+        return None, ({'error': f'Could not read resume: {e}'}, 422)
+    
+    # Check if text was extracted
+    if not resume_text or len(resume_text.strip()) < MIN_RESUME_TEXT_LENGTH:
+        return None, ({'error': 'Could not extract sufficient text from resume'}, 400)
+    
+    return resume_text, None
+
+
+def process_resume_file(file_path, file_extension, filename=None):
+    """Extract and analyze a saved upload, returning (payload, status)"""
+    resume_text, error = extract_resume_text(file_path, file_extension)
+    if error is not None:
+        return error
+    
+    content_hash = file_content_hash(file_path) if RESUME_STORE_ENABLED else None
+    return analyze_resume(resume_text, content_hash, filename), 200
+
+
+def analyze_upload(file, file_extension):
+    """Save, extract and analyze an admitted upload, returning the response"""
+    # Save the uploaded file under a unique name
+    file_path = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex}.{file_extension}")
+    file.save(file_path)
+    capture_input(file_path, file.filename)
+    
+    try:
+        payload, status = process_resume_file(file_path, file_extension, file.filename)
+    finally:
+        # Clean up uploaded file
+        os.remove(file_path)
+    
+    if status == 413:
+        predict_admission.record_rejection('rejected_too_many_pages')
+    return json_response(payload, status)
+
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """Handle resume upload and prediction"""
@@ -421,7 +778,12 @@ def predict():
         if model is None or tfidf_vectorizer is None or label_encoder is None:
             return jsonify({'error': 'Models not loaded. Please restart the server.'}), 500
         
-        # Check if file was uploaded
+        # Reject oversized uploads before reading the body
+        if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+            return upload_too_large_response()
+        
+        # Check if file was uploaded (this reads the whole upload, so a slow
+        # client is done sending before it can take an admission slot)
         if 'resume' not in request.files:
             return jsonify({'error': 'No file uploaded'}), 400
         
@@ -430,94 +792,24 @@ def predict():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Save the uploaded file
-        file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-        file.save(file_path)
-        
-        # Extract text based on file type
-        file_extension = file.filename.rsplit('.', 1)[1].lower()
-        
-        if file_extension == 'pdf':
-            resume_text = extract_text_from_pdf(file_path)
-        elif file_extension == 'docx':
-            resume_text = extract_text_from_docx(file_path)
-        elif file_extension == 'txt':
-            resume_text = extract_text_from_txt(file_path)
-        else:
+        file_extension = get_file_extension(file.filename)
+        if file_extension not in TEXT_EXTRACTORS:
             return jsonify({'error': 'Unsupported file format. Please upload PDF, DOCX, or TXT'}), 400
         
-        # Clean up uploaded file
-        os.remove(file_path)
-        
-        # Check if text was extracted
-        if not resume_text or len(resume_text.strip()) < 50:
-            return jsonify({'error': 'Could not extract sufficient text from resume'}), 400
-        
-        # Extract skills from resume
-        resume_skills = extract_skills(resume_text)
-        
-        # Clean and transform text
-        cleaned_text = clean_text(resume_text)
-        features = tfidf_vectorizer.transform([cleaned_text])
-        
-        # Make prediction
-        prediction = model.predict(features)[0]
-        probabilities = model.predict_proba(features)[0]
+        # Shed load instead of queueing without bound
+        if not predict_admission.acquire():
+            return overloaded_response()
         
-        # Get top 3 predictions
-        top_3_idx = np.argsort(probabilities)[-3:][::-1]
-        top_3_categories = label_encoder.inverse_transform(top_3_idx)
-        top_3_probabilities = probabilities[top_3_idx]
-        
-        # Prepare top 3 recommendations with skill matching
-        recommendations = []
-        for cat, prob in zip(top_3_categories, top_3_probabilities):
-            match_pct, matched_skills, missing_skills = calculate_skill_match(resume_skills, cat)
-            
-            recommendations.append({
-                'role': cat,
-                'confidence': float(prob),
-                'skill_match': float(match_pct),
-                'matched_skills': matched_skills[:5],  # Top 5 matched skills
-                'missing_skills': missing_skills[:5] if len(recommendations) == 0 else []  # Only for top role
-            })
-        
-        # Select best fit role based on stats
-        best_fit, best_score = select_best_fit_role(recommendations)
-        
-        # Get job links for top 3 roles
-        job_opportunities = []
-        for rec in recommendations:
-            job_opportunities.append({
-                'role': rec['role'],
-                'links': get_job_links(rec['role'])
-            })
-        
-        # Generate interview questions for all top 3 roles
-        interview_questions_all = []
-        for rec in recommendations:
-            questions = get_interview_questions(rec['role'], resume_skills)
-            interview_questions_all.append({
-                'role': rec['role'],
-                'questions': questions
-            })
-        
-        # Prepare response with new features
-        response = {
-            'primary_role': recommendations[0]['role'],
-            'primary_confidence': recommendations[0]['confidence'],
-            'recommendations': recommendations,
-            'extracted_skills': resume_skills[:10],
-            'best_fit_role': {
-                'role': best_fit['role'],
-                'combined_score': float(best_score * 100),
-                'reason': f"Best match based on {int(best_fit['confidence']*100)}% confidence and {int(best_fit['skill_match'])}% skill match"
-            },
-            'job_opportunities': job_opportunities,
-            'interview_prep': interview_questions_all
-        }
-        
-        return jsonify(response)
+        try:
+            # Profile admitted requests only: shed ones would push real profiles out of the ring
+            if should_profile(request.headers.get(PROFILE_HEADER)):
+                return run_profiled(lambda: analyze_upload(file, file_extension), request.path)
+            return analyze_upload(file, file_extension)
+        finally:
+            predict_admission.release()
+    
+    except RequestEntityTooLarge:
+        return upload_too_large_response()
     
     except Exception as e:
         import traceback
@@ -529,10 +821,115 @@ def predict():
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+def health_status(admission=predict_admission):
+    """Body of the /health response, shared with the ASGI app"""
+    return {
+        'status': 'healthy',
+        'models_loaded': model is not None,
+        'admission': admission.stats(),
+        'extraction': extraction_pool.stats(),
+        'cascade': dict(
+            cascade_stats(),
+            enabled=cascade_stage is not None,
+            target_agreement=cascade_stage['target_agreement'] if cascade_stage is not None else None,
+        ),
+        'micro_batching': (
+            dict(inference_batcher.stats(), enabled=True) if inference_batcher is not None else {'enabled': False}
+        ),
+    }
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'models_loaded': model is not None})
+    return jsonify(health_status())
+
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness check: 200 only once the models are loaded and warm-up has finished"""
+    status = warmup_state.status()
+    is_ready = model is not None and status['ready']
+    return jsonify(dict(status, ready=is_ready)), 200 if is_ready else 503
+
+
+def warm_up_predict(file_path, file_extension):
+    """Run a canned resume through the /predict pipeline, returning the status code
+
+    Extraction, analysis, serialization and compression run as for a real
+    upload, but the resume is not stored and admission, profiling, extraction,
+    cascade and micro-batching statistics are left untouched.
+    """
+    resume_text, error = extract_resume_text(file_path, file_extension, warmup=True)
+    if error is not None:
+        return error[1]
+    
+    payload = analyze_resume(resume_text, warmup=True)
+    with app.test_request_context('/predict', method='POST', headers={'Accept-Encoding': 'gzip, br'}):
+        compress_response(json_response(payload))
+    return 200
+
+
+def start_warmup():
+    """Warm up the prediction pipeline in the background so /health answers meanwhile"""
+    global warmup_thread
+    warmup_thread = warmup_state.start(warm_up_predict)
+
+
+@app.route('/profiles', methods=['GET'])
+def profiles():
+    """List recorded request profiles"""
+    if not PROFILING_ENABLED or not token_matches(request.headers.get(PROFILE_HEADER)):
+        abort(404)
+    return jsonify({'profiles': list_profiles()})
+
+
+@app.route('/profiles/<entry_id>/<filename>', methods=['GET'])
+def profile_file(entry_id, filename):
+    """Download a recorded profile or its captured input"""
+    if not PROFILING_ENABLED or not token_matches(request.headers.get(PROFILE_HEADER)):
+        abort(404)
+    if not profile_exists(entry_id) or filename == META_FILE:
+        abort(404)
+    return send_from_directory(os.path.join(PROFILE_DIR, entry_id), filename, as_attachment=True)
+
+
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    """Return JSON when a body exceeds MAX_CONTENT_LENGTH"""
+    return upload_too_large_response()
+
+
+@app.after_request
+def compress_response(response):
+    """Add an ETag and gzip/brotli-compress text responses"""
+    if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or not 200 <= response.status_code < 300:
+        return response
+    
+    data = response.get_data()
+    encoding = select_content_encoding() if len(data) >= COMPRESSION_MIN_SIZE else None
+    
+    # Strong ETag over the uncompressed body, distinct per encoding
+    digest = hashlib.sha1(data).hexdigest()
+    response.set_etag(f"{digest}-{encoding}" if encoding else digest)
+    response.vary.add('Accept-Encoding')
+    
+    if request.method in ('GET', 'HEAD'):
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+    
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    else:
+        return response
+    
+    response.headers['Content-Encoding'] = encoding
+    return response
 
 
 if __name__ == '__main__':
@@ -544,10 +941,12 @@ if __name__ == '__main__':
     print("\nInitializing NLTK data...")
     download_nltk_data()
     print("✓ NLTK data ready")
+    load_asset_manifest()
     
     # Load models
     try:
         load_models()
+        start_warmup()
         print("\n" + "=" * 60)
         print("🚀 Starting server...")
         
@@ -566,4 +965,6 @@ if __name__ == '__main__':
 else:
     # For production (gunicorn)
     download_nltk_data()
+    load_asset_manifest()
     load_models()
+    start_warmup()
@@ -0,0 +1,310 @@
+import os
+import uuid
+import hashlib
+import asyncio
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, FileResponse, Response
+from starlette.routing import Route, Mount
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+
+# Importing app loads NLTK data, models and the asset manifest, so forked
+# inference workers start with everything already in memory
+import app as resume_app
+from admission import (
+    ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT, MAX_CONCURRENT_PREDICTIONS, MAX_UPLOAD_BYTES, MAX_UPLOAD_MB,
+    RETRY_AFTER_SECONDS, AsyncAdmissionController,
+)
+from extraction_pool import extraction_pool
+from resume_store import RESUME_STORE_ENABLED
+from warmup import WarmupState
+
+# Process pool size for cleaning + inference (defaults to one per core);
+# text extraction runs in the sandboxed extraction pool
+POOL_WORKERS = int(os.environ.get('ASGI_POOL_WORKERS', os.cpu_count() or 1))
+# How long a warm-up task waits for the other pool workers to pick up theirs
+POOL_WARMUP_TIMEOUT = 60
+
+pool = None
+pool_warmup = WarmupState()
+# Shared by the pool workers during warm-up (set by lifespan and init_pool_worker)
+pool_barrier = None
+# Queued requests wait on the event loop, not in executor threads
+predict_admission = AsyncAdmissionController(
+    MAX_CONCURRENT_PREDICTIONS, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT
+)
+templates = Jinja2Templates(directory='templates')
+
+
+def asset_url(filename):
+    """Template helper mirroring app.asset_url for the ASGI app"""
+    hashed_name = resume_app.ASSET_MANIFEST.get(filename)
+    if hashed_name is None:
+        return f"/static/{filename}"
+    return f"/assets/{hashed_name}"
+
+
+templates.env.globals['asset_url'] = asset_url
+
+
+def json_response(payload, status_code=200):
+    """Serialize a payload with the same encoder as the Flask app"""
+    response = resume_app.json_response(payload, status_code)
+    return Response(response.get_data(), status_code=status_code, media_type='application/json')
+
+
+async def home(request):
+    """Serve the home page"""
+    return templates.TemplateResponse(request, 'homePage.html')
+
+
+async def screening(request):
+    """Serve the resume screening page"""
+    return templates.TemplateResponse(request, 'index.html')
+
+
+async def resume_builder(request):
+    """Serve the resume builder page"""
+    return templates.TemplateResponse(request, 'resume_builder.html')
+
+
+async def predict(request):
+    """Handle resume upload on the event loop and analyze it in the process pool"""
+    try:
+        if resume_app.model is None or resume_app.tfidf_vectorizer is None or resume_app.label_encoder is None:
+            return JSONResponse({'error': 'Models not loaded. Please restart the server.'}, status_code=500)
+
+        # Reject oversized uploads before reading the body
+        content_length = request.headers.get('content-length')
+        if content_length is not None:
+            if not content_length.isdigit():
+                return JSONResponse({'error': 'Invalid Content-Length header'}, status_code=400)
+            if int(content_length) > MAX_UPLOAD_BYTES:
+                return upload_too_large_response()
+
+        # Chunked uploads carry no length: enforce the limit while reading.
+        # The whole upload is read before admission, so slow clients hold no slot
+        body = await read_limited_body(request)
+        if body is None:
+            return upload_too_large_response()
+        form = await Request(request.scope, replay_body(body)).form()
+        file = form.get('resume')
+
+        if file is None or isinstance(file, str):
+            return JSONResponse({'error': 'No file uploaded'}, status_code=400)
+
+        if not file.filename:
+            return JSONResponse({'error': 'No file selected'}, status_code=400)
+
+        file_extension = resume_app.get_file_extension(file.filename)
+        if file_extension not in resume_app.TEXT_EXTRACTORS:
+            return JSONResponse({'error': 'Unsupported file format. Please upload PDF, DOCX, or TXT'}, status_code=400)
+
+        data = await file.read()
+
+        # Shed load instead of queueing without bound
+        if not await predict_admission.acquire():
+            return JSONResponse(
+                {'error': 'Server is busy analyzing other resumes. Please retry shortly.'},
+                status_code=503,
+                headers={'Retry-After': str(RETRY_AFTER_SECONDS)},
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            # Write the upload without blocking the loop
+            file_path = os.path.join(resume_app.UPLOAD_FOLDER, f"{uuid.uuid4().hex}.{file_extension}")
+            await loop.run_in_executor(None, write_upload, file_path, data)
+
+            try:
+                resume_text, error = await loop.run_in_executor(
+                    None, resume_app.extract_resume_text, file_path, file_extension
+                )
+            finally:
+                os.remove(file_path)
+
+            if error is not None:
+                payload, status = error
+                if status == 413:
+                    predict_admission.record_rejection('rejected_too_many_pages')
+                return json_response(payload, status)
+
+            content_hash = hashlib.sha256(data).hexdigest() if RESUME_STORE_ENABLED else None
+            if resume_app.inference_batcher is None and resume_app.cascade_stage is None:
+                payload = await loop.run_in_executor(
+                    pool, resume_app.analyze_resume, resume_text, content_hash, file.filename
+                )
+            else:
+                # Clean in the pool, then score in this process: inference is batched across
+                # concurrent requests (each pool worker only ever sees one at a time), and the
+                # cascade and batching counters reported by /health live here
+                resume_skills, cleaned_text = await loop.run_in_executor(
+                    pool, resume_app.preprocess_resume, resume_text
+                )
+                payload = await loop.run_in_executor(
+                    None, resume_app.score_resume,
+                    resume_text, resume_skills, cleaned_text, content_hash, file.filename,
+                )
+            return json_response(payload)
+        finally:
+            predict_admission.release()
+
+    except Exception as e:
+        import traceback
+        print(f"\n❌ Error occurred during prediction:")
+        print(f"Error type: {type(e).__name__}")
+        print(f"Error message: {str(e)}")
+        print(f"Traceback:")
+        traceback.print_exc()
+        return JSONResponse({'error': f'An error occurred: {str(e)}'}, status_code=500)
+
+
+def upload_too_large_response():
+    """Fast 413 for uploads over MAX_UPLOAD_MB"""
+    predict_admission.record_rejection('rejected_too_large')
+    return JSONResponse({'error': f'File too large. Maximum upload size is {MAX_UPLOAD_MB:g}MB'}, status_code=413)
+
+
+async def read_limited_body(request):
+    """Read the request body, or return None as soon as it exceeds MAX_UPLOAD_BYTES"""
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            return None
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def replay_body(body):
+    """ASGI receive callable that hands an already-read body to the form parser"""
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+    return receive
+
+
+def write_upload(file_path, data):
+    """Write uploaded bytes to disk"""
+    with open(file_path, 'wb') as file:
+        file.write(data)
+
+
+async def health(request):
+    """Health check endpoint"""
+    return JSONResponse(resume_app.health_status(predict_admission))
+
+
+async def ready(request):
+    """Readiness check: 200 only once both the app and the process pool are warmed up"""
+    app_status = resume_app.warmup_state.status()
+    pool_status = pool_warmup.status()
+    is_ready = resume_app.model is not None and app_status['ready'] and pool_status['ready']
+    return JSONResponse(
+        {'ready': is_ready, 'app': app_status, 'pool': pool_status},
+        status_code=200 if is_ready else 503,
+    )
+
+
+async def assets(request):
+    """Serve fingerprinted assets with immutable caching and precompressed variants"""
+    filename = request.path_params['filename']
+    if filename not in resume_app.ASSET_MANIFEST.values():
+        return Response(status_code=404)
+
+    accept_encoding = request.headers.get('accept-encoding', '')
+    headers = {
+        'Cache-Control': f'public, max-age={resume_app.ASSET_MAX_AGE}, immutable',
+        'Vary': 'Accept-Encoding',
+    }
+    served_name = filename
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in accept_encoding and os.path.exists(os.path.join(resume_app.ASSET_FOLDER, filename + suffix)):
+            served_name = filename + suffix
+            headers['Content-Encoding'] = candidate
+            break
+
+    media_type = 'text/css' if filename.endswith('.css') else 'application/javascript'
+    return FileResponse(os.path.join(resume_app.ASSET_FOLDER, served_name), media_type=media_type, headers=headers)
+
+
+def init_pool_worker(barrier):
+    """Process pool initializer: keep the warm-up barrier shared by all workers"""
+    global pool_barrier
+    pool_barrier = barrier
+
+
+def warm_up_worker(resume_text):
+    """Pool warm-up task: analyze once, then wait until every worker has done the same
+
+    A worker blocked at the barrier cannot take another task, so
+    POOL_WORKERS tasks land on POOL_WORKERS different workers.
+    """
+    resume_app.analyze_resume(resume_text, warmup=True)
+    pool_barrier.wait(POOL_WARMUP_TIMEOUT)
+
+
+def warm_up_pool(file_path, file_extension):
+    """Extract a canned resume and analyze it in every pool worker, returning the status code"""
+    resume_text, error = resume_app.extract_resume_text(file_path, file_extension, warmup=True)
+    if error is not None:
+        return error[1]
+    futures = [pool.submit(warm_up_worker, resume_text) for _ in range(POOL_WORKERS)]
+    try:
+        for future in futures:
+            future.result()
+    except Exception:
+        # A broken barrier stays broken: make it usable for the next sample
+        pool_barrier.reset()
+        raise
+    return 200
+
+
+@contextlib.asynccontextmanager
+async def lifespan(application):
+    """Start the shared process pool with the server and stop it on shutdown"""
+    global pool, pool_barrier
+    pool_barrier = multiprocessing.Barrier(POOL_WORKERS)
+    pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, initializer=init_pool_worker, initargs=(pool_barrier,))
+    print(f"✓ Process pool started ({POOL_WORKERS} workers)")
+    # Fork the pool workers only after the in-process warm-up is done with its threads
+    pool_warmup.start(warm_up_pool, after=resume_app.warmup_thread)
+    try:
+        yield
+    finally:
+        pool.shutdown(cancel_futures=True)
+        extraction_pool.shutdown()
+
+
+app = Starlette(
+    routes=[
+        Route('/', home),
+        Route('/screening', screening),
+        Route('/resume-builder', resume_builder),
+        Route('/predict', predict, methods=['POST']),
+        Route('/health', health, methods=['GET']),
+        Route('/ready', ready, methods=['GET']),
+        Route('/assets/{filename:path}', assets),
+        Mount('/static', app=StaticFiles(directory='static'), name='static'),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*']),
+        Middleware(GZipMiddleware, minimum_size=resume_app.COMPRESSION_MIN_SIZE),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
@@ -0,0 +1,257 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import multiprocessing
+
+from extraction_pool import (
+    EXTRACTION_MAX_TASKS_PER_CHILD, EXTRACTION_MEMORY_MB, EXTRACTION_TIMEOUT, EXTRACTION_WORKERS, ExtractionPool,
+)
+from text_extraction import TEXT_EXTRACTORS
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+# Importing app loads the trained models (shared with forked extraction workers);
+# skip the server warm-up, which would also leave a thread running across the fork
+os.environ.setdefault('WARMUP_ENABLED', '0')
+import app as resume_app
+
+BATCH_SIZE = 500
+OUTPUT_FIELDS = [
+    'file', 'primary_role', 'primary_confidence', 'best_fit_role', 'best_fit_score',
+    'role_2', 'confidence_2', 'role_3', 'confidence_3',
+    'skill_match', 'matched_skills', 'missing_skills', 'extracted_skills',
+]
+
+
+def find_resume_files(input_dir):
+    """Relative paths of every supported resume file under input_dir, in a stable order"""
+    found = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if resume_app.get_file_extension(name) in TEXT_EXTRACTORS:
+                found.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return found
+
+
+def drop_partial_line(path, block_size=1 << 16):
+    """Truncate a half-written trailing line left behind by an interrupted run
+
+    Only the tail of the file is read: it is scanned backwards from the end
+    for the last newline.
+    """
+    with open(path, 'rb+') as file:
+        end = file.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        file.seek(end - 1)
+        if file.read(1) == b'\n':
+            return
+
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b'\n')
+            if newline != -1:
+                file.truncate(start + newline + 1)
+                return
+            position = start
+        file.truncate(0)
+
+
+def completed_files(output_path, output_format):
+    """Files already scored in a previous run of the same output"""
+    if not os.path.exists(output_path):
+        return set()
+
+    drop_partial_line(output_path)
+    with open(output_path, 'r', encoding='utf-8', newline='') as file:
+        if output_format == 'csv':
+            return {row['file'] for row in csv.DictReader(file)}
+        return {json.loads(line)['file'] for line in file if line.strip()}
+
+
+# Each extraction worker's own sandbox, set up by init_extraction_worker
+worker_extraction_pool = None
+
+
+def init_extraction_worker():
+    """Give this extraction worker one sandboxed process of its own
+
+    Documents are parsed in the sandbox, so a hanging or runaway file is
+    killed after EXTRACTION_TIMEOUT and reported as a per-file error.
+    EXTRACTION_WORKERS=0 extracts inline, as in the server.
+    """
+    global worker_extraction_pool
+    worker_extraction_pool = ExtractionPool(
+        min(EXTRACTION_WORKERS, 1), EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB, EXTRACTION_MAX_TASKS_PER_CHILD
+    )
+
+
+def extract_resume(task):
+    """Extraction worker: return (file, resume_text, cleaned_text, skills, error)"""
+    input_dir, rel_path = task
+    try:
+        resume_text = worker_extraction_pool.extract(
+            resume_app.get_file_extension(rel_path), os.path.join(input_dir, rel_path)
+        )
+        if not resume_text or len(resume_text.strip()) < resume_app.MIN_RESUME_TEXT_LENGTH:
+            return rel_path, None, None, None, 'Could not extract sufficient text from resume'
+        return (
+            rel_path,
+            resume_text,
+            resume_app.clean_text(resume_text),
+            resume_app.extract_skills(resume_text),
+            None,
+        )
+    except Exception as e:
+        return rel_path, None, None, None, f"{type(e).__name__}: {e}"
+
+
+def result_record(rel_path, response):
+    """Flatten a /predict response into one output record"""
+    recommendations = response['recommendations']
+    record = {
+        'file': rel_path,
+        'primary_role': response['primary_role'],
+        'primary_confidence': round(response['primary_confidence'], 4),
+        'best_fit_role': response['best_fit_role']['role'],
+        'best_fit_score': round(response['best_fit_role']['combined_score'], 2),
+        'skill_match': round(recommendations[0]['skill_match'], 2),
+        'matched_skills': recommendations[0]['matched_skills'],
+        'missing_skills': recommendations[0]['missing_skills'],
+        'extracted_skills': response['extracted_skills'],
+    }
+    for rank, rec in enumerate(recommendations[1:3], start=2):
+        record[f'role_{rank}'] = rec['role']
+        record[f'confidence_{rank}'] = round(rec['confidence'], 4)
+    return record
+
+
+class ResultWriter:
+    """Append-only CSV or JSONL writer, flushed after every batch"""
+
+    def __init__(self, output_path, output_format):
+        self.output_format = output_format
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self.file = open(output_path, 'a', encoding='utf-8', newline='')
+        if output_format == 'csv':
+            self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS)
+            if is_new:
+                self.writer.writeheader()
+
+    def write(self, records):
+        for record in records:
+            if self.output_format == 'csv':
+                self.writer.writerow({
+                    key: '; '.join(value) if isinstance(value, list) else value
+                    for key, value in record.items()
+                })
+            else:
+                self.file.write(json.dumps(record, default=str) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def score_batch(batch):
+    """Vectorize and predict a batch of extracted resumes in one call"""
+    features = resume_app.tfidf_vectorizer.transform([item[2] for item in batch])
+    probabilities = resume_app.model.predict_proba(features)
+    return [
+        result_record(rel_path, resume_app.build_prediction_response(skills, row_probabilities))
+        for (rel_path, _, _, skills, _), row_probabilities in zip(batch, probabilities)
+    ]
+
+
+def score_directory(input_dir, output_path, output_format, error_log, workers, batch_size):
+    """Extract, score and stream results for every resume under input_dir"""
+    files = find_resume_files(input_dir)
+    done = completed_files(output_path, output_format)
+    pending = [rel_path for rel_path in files if rel_path not in done]
+    print(f"Found {len(files)} resume files, {len(files) - len(pending)} already scored, {len(pending)} to go")
+    if not pending:
+        return
+
+    writer = ResultWriter(output_path, output_format)
+    errors = open(error_log, 'a', encoding='utf-8')
+    progress = tqdm(total=len(pending), unit='file') if tqdm else None
+    counts = {'scored': 0, 'failed': 0}
+    predict_seconds = 0.0
+    start = time.perf_counter()
+
+    def flush(batch):
+        nonlocal predict_seconds
+        predict_start = time.perf_counter()
+        writer.write(score_batch(batch))
+        predict_seconds += time.perf_counter() - predict_start
+        counts['scored'] += len(batch)
+        if progress is None:
+            elapsed = time.perf_counter() - start
+            print(f"  - {counts['scored'] + counts['failed']}/{len(pending)} files "
+                  f"({(counts['scored'] + counts['failed']) / elapsed:.1f} files/s)")
+
+    # Workers are forked after the models load, so they share them copy-on-write;
+    # parsing itself runs in each worker's sandbox, which recycles its own process
+    context = multiprocessing.get_context('fork')
+    batch = []
+    try:
+        with context.Pool(workers, initializer=init_extraction_worker) as pool:
+            tasks = ((input_dir, rel_path) for rel_path in pending)
+            for result in pool.imap_unordered(extract_resume, tasks, chunksize=4):
+                rel_path, error = result[0], result[4]
+                if error is not None:
+                    counts['failed'] += 1
+                    errors.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{rel_path}\t{error}\n")
+                    errors.flush()
+                else:
+                    batch.append(result)
+                    if len(batch) >= batch_size:
+                        flush(batch)
+                        batch = []
+                if progress is not None:
+                    progress.update(1)
+            if batch:
+                flush(batch)
+    finally:
+        if progress is not None:
+            progress.close()
+        writer.close()
+        errors.close()
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "=" * 60)
+    print("Batch scoring report")
+    print("=" * 60)
+    print(f"Scored: {counts['scored']}  Failed: {counts['failed']}  (errors logged to {error_log})")
+    print(f"Elapsed: {elapsed:.1f}s  Throughput: {(counts['scored'] + counts['failed']) / elapsed:.1f} files/s")
+    print(f"Vectorize/predict/skill-match: {predict_seconds:.1f}s "
+          f"({counts['scored'] / predict_seconds if predict_seconds else 0:.0f} resumes/s)")
+    print(f"Results: {output_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory tree of PDF/DOCX/TXT resumes")
+    parser.add_argument('input_dir')
+    parser.add_argument('-o', '--output', default='batch_results.csv',
+                        help="results file, .csv or .jsonl (default: %(default)s)")
+    parser.add_argument('--errors', default=None, help="per-file error log (default: <output>.errors.log)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    output_format = 'jsonl' if args.output.endswith(('.jsonl', '.json')) else 'csv'
+    error_log = args.errors or f"{args.output}.errors.log"
+    score_directory(args.input_dir, args.output, output_format, error_log, args.workers, args.batch_size)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
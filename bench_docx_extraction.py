@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import docx
+
+from docx_extract import extract_text_from_docx_xml
+
+# Benchmark settings
+SECTIONS = 400
+TABLE_ROWS = 8
+REPEATS = 3
+
+
+def extract_with_python_docx(file_path):
+    """Reference extractor: python-docx object model, body paragraphs only"""
+    doc = docx.Document(file_path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def extract_with_python_docx_tables(file_path):
+    """Reference extractor: python-docx body paragraphs plus every table cell"""
+    doc = docx.Document(file_path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text += cell.text + "\n"
+    return text
+
+
+EXTRACTORS = {
+    'python-docx': extract_with_python_docx,
+    'python-docx+tbl': extract_with_python_docx_tables,
+    'streaming XML': extract_text_from_docx_xml,
+}
+
+
+def build_sample_docx(file_path, sections):
+    """Write a large resume-like DOCX with paragraphs, skill tables and a header"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | Senior Data Engineer | jane@example.com"
+
+    for i in range(sections):
+        document.add_heading(f"Project {i}", level=2)
+        document.add_paragraph(
+            "Designed and maintained ETL pipelines in Python and SQL, deployed with Docker "
+            "and Kubernetes on AWS, and mentored a team of four engineers."
+        )
+        table = document.add_table(rows=TABLE_ROWS, cols=2)
+        for row_idx, row in enumerate(table.rows):
+            row.cells[0].text = f"Skill {row_idx}"
+            row.cells[1].text = "spark, hadoop, kafka, airflow"
+
+    document.save(file_path)
+
+
+def peak_rss_increase(name, file_path):
+    """Run one extraction in a fresh process and return its peak RSS growth in KB"""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    EXTRACTORS[name](file_path)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+def measure(name, file_path):
+    """Return best wall time, peak RSS growth and extracted text for an extractor"""
+    extractor = EXTRACTORS[name]
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        text = extractor(file_path)
+        best = min(best, time.perf_counter() - start)
+
+    # libxml2 allocations are invisible to tracemalloc, so compare process RSS
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        peak_kb = executor.submit(peak_rss_increase, name, file_path).result()
+    return best, peak_kb, text
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else SECTIONS
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "large_resume.docx")
+        print(f"Building sample DOCX with {sections} sections...")
+        build_sample_docx(file_path, sections)
+        print(f"✓ {os.path.getsize(file_path) / 1024:.0f} KB")
+
+        results = {name: measure(name, file_path) for name in EXTRACTORS}
+
+    print("\n" + "=" * 60)
+    print(f"{'Extractor':<16}{'Time (ms)':>12}{'Peak RSS (KB)':>20}{'Chars':>10}")
+    print("=" * 60)
+    for name, (elapsed, peak, text) in results.items():
+        print(f"{name:<16}{elapsed * 1000:>12.1f}{peak:>20}{len(text):>10}")
+
+    reference_lines = {line for line in results['python-docx+tbl'][2].splitlines() if line}
+    streamed_lines = set(results['streaming XML'][2].splitlines())
+    missing = reference_lines - streamed_lines
+    print(f"\nSuperset of python-docx text: {'yes' if not missing else f'no ({len(missing)} lines missing)'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import os
+import json
+import gzip
+import shutil
+import hashlib
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# File paths
+STATIC_FOLDER = "static"
+DIST_FOLDER = os.path.join(STATIC_FOLDER, "dist")
+MANIFEST_FILE = os.path.join(DIST_FOLDER, "manifest.json")
+
+# Assets to fingerprint (paths relative to the static folder)
+STATIC_ASSETS = ['script.js', 'style.css']
+
+HASH_LENGTH = 10
+
+
+def minify(filename, source):
+    """Minify JS/CSS source if a minifier is available"""
+    if filename.endswith('.js') and rjsmin is not None:
+        return rjsmin.jsmin(source)
+    if filename.endswith('.css') and rcssmin is not None:
+        return rcssmin.cssmin(source)
+    return source
+
+
+def fingerprint(filename, data):
+    """Insert a content hash into the filename (style.css -> style.<hash>.css)"""
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    base, ext = os.path.splitext(filename)
+    return f"{base}.{digest}{ext}"
+
+
+def write_compressed_variants(path, data):
+    """Write .gz (and .br when brotli is installed) next to an asset"""
+    with open(path + '.gz', 'wb') as file:
+        file.write(gzip.compress(data, compresslevel=9, mtime=0))
+
+    if brotli is not None:
+        with open(path + '.br', 'wb') as file:
+            file.write(brotli.compress(data, quality=11))
+
+
+def build_static_assets():
+    """Minify, fingerprint and pre-compress static assets"""
+    print("Building static assets...")
+
+    # Start from a clean output folder so stale fingerprints don't pile up
+    shutil.rmtree(DIST_FOLDER, ignore_errors=True)
+    os.makedirs(DIST_FOLDER, exist_ok=True)
+
+    manifest = {}
+    for filename in STATIC_ASSETS:
+        with open(os.path.join(STATIC_FOLDER, filename), 'r', encoding='utf-8') as file:
+            source = file.read()
+
+        data = minify(filename, source).encode('utf-8')
+        hashed_name = fingerprint(filename, data)
+        output_path = os.path.join(DIST_FOLDER, hashed_name)
+
+        with open(output_path, 'wb') as file:
+            file.write(data)
+        write_compressed_variants(output_path, data)
+
+        manifest[filename] = hashed_name
+        print(f"✓ {filename} -> dist/{hashed_name} ({len(source.encode('utf-8'))} -> {len(data)} bytes)")
+
+    with open(MANIFEST_FILE, 'w') as file:
+        json.dump(manifest, file, indent=2)
+    print(f"✓ Manifest saved to: {MANIFEST_FILE}")
+
+    if rjsmin is None or rcssmin is None:
+        print("⚠️  rjsmin/rcssmin not installed, some assets were not minified")
+    if brotli is None:
+        print("⚠️  brotli not installed, only gzip variants were written")
+
+    return manifest
+
+
+if __name__ == '__main__':
+    build_static_assets()
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+# First-stage model settings
+FAST_MAX_FEATURES = 1500
+FAST_C = 10.0
+# Share of first-stage answers that must agree with the full model (overridable through the environment)
+TARGET_AGREEMENT = float(os.environ.get('CASCADE_TARGET_AGREEMENT', 0.98))
+# Agreement targets compared by main.py's cascade report
+REPORT_TARGETS = (0.90, 0.95, 0.98, 0.99)
+MARGIN_GRID = np.round(np.arange(0.0, 1.0, 0.01), 2)
+
+
+def train_first_stage(cleaned_texts, y):
+    """Train the cheap first stage: a unigram-only TF-IDF and logistic regression
+
+    The first stage has its own small vectorizer, so resumes it answers skip
+    the full model's unigram+bigram transform. ``y`` should be the full
+    model's predictions rather than the true labels: the first stage is meant
+    to reproduce the full model, not to beat it.
+    """
+    vectorizer = TfidfVectorizer(ngram_range=(1, 1), max_features=FAST_MAX_FEATURES, min_df=2, max_df=0.9)
+    model = LogisticRegression(max_iter=2000, C=FAST_C, random_state=42)
+    model.fit(vectorizer.fit_transform(cleaned_texts), y)
+    return vectorizer, model
+
+
+def first_stage_scores(stage, cleaned_texts, n_classes):
+    """Return full-width class probabilities and the top-1/top-2 margin of the first stage"""
+    partial = stage['model'].predict_proba(stage['vectorizer'].transform(cleaned_texts))
+
+    # The first stage may know fewer classes than the full label encoder
+    probabilities = np.zeros((partial.shape[0], n_classes), dtype=partial.dtype)
+    probabilities[:, stage['model'].classes_] = partial
+
+    top_2 = np.sort(partial, axis=1)[:, -2:]
+    margin = top_2[:, -1] - (top_2[:, 0] if partial.shape[1] > 1 else 0.0)
+    return probabilities, margin
+
+
+def keyword_support(top_classes, resume_skills_list, class_names, skill_sets):
+    """True where the predicted role has no skill list or the resume mentions one of its skills"""
+    support = np.ones(len(top_classes), dtype=bool)
+    for i, (class_idx, resume_skills) in enumerate(zip(top_classes, resume_skills_list)):
+        required = skill_sets.get(class_names[class_idx])
+        if required:
+            support[i] = not required.isdisjoint(resume_skills)
+    return support
+
+
+def accept_first_stage(stage, margin, support):
+    """Rows the first stage answers on its own"""
+    return (margin >= stage['margin_threshold']) & support
+
+
+def calibrate_margin(margin, support, agrees, target=TARGET_AGREEMENT):
+    """Smallest margin threshold whose accepted rows agree with the full model at >= target"""
+    for threshold in MARGIN_GRID:
+        accepted = (margin >= threshold) & support
+        if not accepted.any():
+            break
+        if agrees[accepted].mean() >= target:
+            return float(threshold)
+    # Never confident enough: every request escalates
+    return float('inf')
+
+
+def set_target_agreement(stage, target=TARGET_AGREEMENT):
+    """Recalibrate the stage's margin threshold for another agreement target
+
+    Uses the calibration-set margins stored with the stage, so changing the
+    target needs no retraining.
+    """
+    stage['target_agreement'] = target
+    stage['margin_threshold'] = calibrate_margin(*stage['calibration'], target=target)
+    return stage['margin_threshold']
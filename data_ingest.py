@@ -0,0 +1,106 @@
+import os
+import json
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Standard column names used by the training pipeline
+TEXT_COLUMN = "resume_text"
+LABEL_COLUMN = "category"
+
+CORPUS_SCHEMA = pa.schema([
+    (LABEL_COLUMN, pa.string()),
+    (TEXT_COLUMN, pa.string()),
+])
+
+
+def source_columns(source):
+    """Return (source_text_column, source_label_column) for a source config"""
+    reverse = {standard: original for original, standard in source['columns'].items()}
+    return reverse[TEXT_COLUMN], reverse[LABEL_COLUMN]
+
+
+def read_source(source, categories):
+    """Read only the text/label columns of one labeled source, keeping allowed categories"""
+    path = source['path']
+    text_col, label_col = source_columns(source)
+
+    if path.endswith('.parquet'):
+        # Column projection and the category filter are pushed down into the reader
+        table = pq.read_table(
+            path,
+            columns=[label_col, text_col],
+            filters=[(label_col, 'in', list(categories))],
+        )
+    else:
+        table = pa_csv.read_csv(
+            path,
+            # Resume text routinely contains quoted line breaks
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=[label_col, text_col],
+                column_types={label_col: pa.string(), text_col: pa.string()},
+            ),
+        )
+        table = table.filter(pc.is_in(table[label_col], value_set=pa.array(list(categories))))
+
+    table = table.select([label_col, text_col]).rename_columns([LABEL_COLUMN, TEXT_COLUMN])
+    return table.cast(CORPUS_SCHEMA)
+
+
+def corpus_metadata(sources, categories):
+    """Parquet key-value metadata identifying what a cached corpus was built from"""
+    return {
+        b'sources': json.dumps([source['path'] for source in sources]).encode(),
+        b'categories': json.dumps(sorted(categories)).encode(),
+    }
+
+
+def corpus_is_fresh(corpus_file, sources, categories):
+    """True if the cached corpus was built from these sources/categories and is newer than them"""
+    if not os.path.exists(corpus_file):
+        return False
+
+    metadata = pq.read_schema(corpus_file).metadata or {}
+    expected = corpus_metadata(sources, categories)
+    if any(metadata.get(key) != value for key, value in expected.items()):
+        return False
+
+    corpus_mtime = os.path.getmtime(corpus_file)
+    return all(os.path.getmtime(source['path']) <= corpus_mtime for source in sources)
+
+
+def load_training_corpus(sources, categories, corpus_file=None):
+    """Merge labeled sources into one (category, resume_text) DataFrame
+
+    The merged corpus is persisted as Parquet at ``corpus_file`` and reused
+    until the source list, a source file or the allowed categories change.
+    """
+    available = [source for source in sources if os.path.exists(source['path'])]
+    for source in sources:
+        if source not in available:
+            print(f"⚠️  Skipping missing data source: {source['path']}")
+
+    if corpus_file and corpus_is_fresh(corpus_file, available, categories):
+        print(f"Loading cached corpus from {corpus_file}...")
+        return pq.read_table(corpus_file).to_pandas()
+
+    if not available:
+        raise FileNotFoundError("No training data sources found: " + ", ".join(s['path'] for s in sources))
+
+    tables = []
+    for source in available:
+        print(f"Loading data from {source['path']}...")
+        table = read_source(source, categories)
+        print(f"  - {table.num_rows} records")
+        tables.append(table)
+
+    corpus = pa.concat_tables(tables).replace_schema_metadata(corpus_metadata(available, categories))
+
+    if corpus_file:
+        pq.write_table(corpus, corpus_file, compression='zstd')
+        print(f"✓ Corpus saved to: {corpus_file}")
+
+    return corpus.to_pandas()
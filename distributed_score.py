@@ -0,0 +1,475 @@
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import threading
+import subprocess
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from data_ingest import TEXT_COLUMN
+
+# Sharding settings (overridable through the environment)
+SHARD_SIZE = int(os.environ.get('SHARD_SIZE', 5000))
+SHARD_LEASE_SECONDS = float(os.environ.get('SHARD_LEASE_SECONDS', 300))
+SHARD_MAX_ATTEMPTS = int(os.environ.get('SHARD_MAX_ATTEMPTS', 3))
+
+ROW_ID_COLUMN = 'row_id'
+MANIFEST_FILE = 'manifest.json'
+SHARD_DIR = 'shards'
+LEASE_DIR = 'leases'
+OUTPUT_DIR = 'outputs'
+ERROR_DIR = 'errors'
+
+
+def shard_name(index):
+    return f"shard-{index:05d}"
+
+
+def shared_path(shared_dir, *parts):
+    return os.path.join(shared_dir, *parts)
+
+
+def lease_path(shared_dir, name, attempt):
+    return shared_path(shared_dir, LEASE_DIR, f"{name}.{attempt}.lease")
+
+
+def output_path(shared_dir, name):
+    return shared_path(shared_dir, OUTPUT_DIR, f"{name}.parquet")
+
+
+def write_json_atomic(path, payload):
+    """Write JSON next to path and rename it into place"""
+    tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(payload, file)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(shared_dir):
+    with open(shared_path(shared_dir, MANIFEST_FILE), 'r') as file:
+        return json.load(file)
+
+
+def iter_input_batches(input_path, batch_size):
+    """Stream record batches from a CSV or Parquet corpus without loading it whole"""
+    if input_path.endswith('.parquet'):
+        yield from pq.ParquetFile(input_path).iter_batches(batch_size=batch_size)
+        return
+    # Resume text routinely contains quoted line breaks
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    # Types inferred from the first block break on later rows (a numeric
+    # candidate_id column that turns into 'ATS-77'): read every column as text
+    with pa_csv.open_csv(input_path, parse_options=parse_options) as header_reader:
+        column_names = header_reader.schema.names
+    reader = pa_csv.open_csv(
+        input_path,
+        parse_options=parse_options,
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in column_names}),
+    )
+    yield from reader
+
+
+def partition(input_path, shared_dir, shard_size, model_version):
+    """Split the input corpus into Parquet shards and write the manifest
+
+    Everything is written to a temporary directory next to shared_dir, which
+    is renamed into place once the manifest is complete: a failed partition
+    leaves nothing behind for workers to pick up.
+    """
+    if os.path.exists(shared_path(shared_dir, MANIFEST_FILE)):
+        raise FileExistsError(f"{shared_dir} is already partitioned; use a fresh shared directory")
+    if os.path.isdir(shared_dir) and os.listdir(shared_dir):
+        raise FileExistsError(f"{shared_dir} is not empty; use a fresh shared directory")
+
+    final_dir = shared_dir
+    shared_dir = f"{os.path.normpath(final_dir)}.{socket.gethostname()}.{os.getpid()}.tmp"
+    for subdir in (SHARD_DIR, LEASE_DIR, OUTPUT_DIR, ERROR_DIR):
+        os.makedirs(shared_path(shared_dir, subdir), exist_ok=True)
+    try:
+        manifest = write_shards(input_path, shared_dir, shard_size, model_version)
+        # Replaces final_dir if it exists but is empty
+        os.rename(shared_dir, final_dir)
+    except BaseException:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+        raise
+    print(f"✓ Partitioned {manifest['num_rows']} resumes into {manifest['num_shards']} shards in {final_dir}")
+    return manifest
+
+
+def write_shards(input_path, shared_dir, shard_size, model_version):
+    """Write the input corpus as Parquet shards plus the manifest into shared_dir"""
+
+    num_shards = 0
+    num_rows = 0
+    pending = []
+    pending_rows = 0
+
+    def write_shard(batches):
+        nonlocal num_shards, num_rows
+        table = pa.Table.from_batches(batches)
+        table = table.append_column(ROW_ID_COLUMN, pa.array(np.arange(num_rows, num_rows + table.num_rows)))
+        name = shard_name(num_shards)
+        pq.write_table(table, shared_path(shared_dir, SHARD_DIR, f"{name}.parquet"), compression='zstd')
+        num_shards += 1
+        num_rows += table.num_rows
+
+    for batch in iter_input_batches(input_path, shard_size):
+        if TEXT_COLUMN not in batch.schema.names:
+            raise ValueError(f"Input has no '{TEXT_COLUMN}' column")
+        while batch.num_rows:
+            take = min(shard_size - pending_rows, batch.num_rows)
+            pending.append(batch.slice(0, take))
+            pending_rows += take
+            batch = batch.slice(take)
+            if pending_rows == shard_size:
+                write_shard(pending)
+                pending, pending_rows = [], 0
+    if pending_rows:
+        write_shard(pending)
+
+    manifest = {
+        'input': os.path.abspath(input_path),
+        'num_shards': num_shards,
+        'num_rows': num_rows,
+        'shard_size': shard_size,
+        'model_version': model_version,
+        'created_at': time.time(),
+    }
+    write_json_atomic(shared_path(shared_dir, MANIFEST_FILE), manifest)
+    return manifest
+
+
+def read_lease(path):
+    """Lease contents, or None if the file is gone or unreadable"""
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def latest_leases(shared_dir):
+    """Highest lease attempt recorded for each shard"""
+    latest = {}
+    for filename in os.listdir(shared_path(shared_dir, LEASE_DIR)):
+        if not filename.endswith('.lease'):
+            continue
+        name, attempt, _ = filename.rsplit('.', 2)
+        attempt = int(attempt)
+        if attempt >= latest.get(name, -1):
+            latest[name] = attempt
+    return latest
+
+
+def lease_expires_at(path, lease_seconds):
+    """Expiry time of a lease file, or None if it vanished
+
+    A lease that cannot be parsed (e.g. a truncated file on a full disk)
+    expires lease_seconds after it was last written.
+    """
+    lease = read_lease(path)
+    if lease is not None:
+        return lease['expires_at']
+    try:
+        return os.path.getmtime(path) + lease_seconds
+    except OSError:
+        return None
+
+
+def shard_states(shared_dir, manifest, max_attempts=SHARD_MAX_ATTEMPTS, lease_seconds=SHARD_LEASE_SECONDS):
+    """Map each shard to ('done'|'leased'|'failed'|'pending', next_attempt)"""
+    latest = latest_leases(shared_dir)
+    done = set(os.listdir(shared_path(shared_dir, OUTPUT_DIR)))
+    now = time.time()
+    states = {}
+    for index in range(manifest['num_shards']):
+        name = shard_name(index)
+        attempt = latest.get(name)
+        if f"{name}.parquet" in done:
+            states[name] = ('done', None)
+        elif attempt is None:
+            states[name] = ('pending', 0)
+        else:
+            expires_at = lease_expires_at(lease_path(shared_dir, name, attempt), lease_seconds)
+            # A lease that vanished while listing is being replaced: treat it as live
+            if expires_at is None or expires_at > now:
+                states[name] = ('leased', None)
+            elif attempt + 1 >= max_attempts:
+                states[name] = ('failed', None)
+            else:
+                states[name] = ('pending', attempt + 1)
+    return states
+
+
+class ShardLease:
+    """A claimed shard attempt, kept alive by a heartbeat thread while it is scored"""
+
+    def __init__(self, shared_dir, name, attempt, worker_id, lease_seconds):
+        self.shared_dir = shared_dir
+        self.name = name
+        self.attempt = attempt
+        self.path = lease_path(shared_dir, name, attempt)
+        self.lease_seconds = lease_seconds
+        self.record = {
+            'shard': name,
+            'attempt': attempt,
+            'worker': worker_id,
+            'claimed_at': time.time(),
+            'expires_at': time.time() + lease_seconds,
+        }
+        self.lost = False
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    @classmethod
+    def claim(cls, shared_dir, name, attempt, worker_id, lease_seconds):
+        """Atomically create the lease for this attempt, or return None if another worker won
+
+        The lease is written in full to a private file and hard-linked into
+        place, so it never exists half-written; link fails if the attempt is taken.
+        """
+        lease = cls(shared_dir, name, attempt, worker_id, lease_seconds)
+        tmp_path = f"{lease.path}.{socket.gethostname()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(lease.record, file)
+        try:
+            os.link(tmp_path, lease.path)
+        except FileExistsError:
+            return None
+        finally:
+            os.remove(tmp_path)
+        return lease
+
+    def superseded(self):
+        """True once another worker has taken over this shard after our lease expired"""
+        return os.path.exists(lease_path(self.shared_dir, self.name, self.attempt + 1))
+
+    def _renew(self, expires_at):
+        self.record['expires_at'] = expires_at
+        write_json_atomic(self.path, self.record)
+
+    def _run_heartbeat(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            if self.superseded():
+                self.lost = True
+                return
+            self._renew(time.time() + self.lease_seconds)
+
+    def __enter__(self):
+        self._heartbeat = threading.Thread(target=self._run_heartbeat, daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._heartbeat.join()
+        if exc_type is not None:
+            # Expire at once so another worker retries without waiting out the lease
+            self._renew(0)
+        return False
+
+
+def score_shard(resume_app, table):
+    """Clean, vectorize, predict and skill-match one shard, returning the output table"""
+    data = table.to_pandas()
+    texts = data[TEXT_COLUMN].fillna('').astype(str)
+
+    cleaned_texts = [resume_app.clean_text(text) for text in texts]
+    probabilities = resume_app.model.predict_proba(resume_app.tfidf_vectorizer.transform(cleaned_texts))
+
+    class_names = resume_app.label_encoder.classes_
+    top_3_idx = np.argsort(probabilities, axis=1)[:, -3:][:, ::-1]
+    predicted_categories = class_names[top_3_idx[:, 0]]
+
+    skill_matches = []
+    matched_skills_list = []
+    for text, category in zip(texts, predicted_categories):
+        match_pct, matched, _ = resume_app.calculate_skill_match(resume_app.extract_skills(text), category)
+        skill_matches.append(float(match_pct))
+        matched_skills_list.append(', '.join(matched[:5]) if matched else 'None')
+
+    data['predicted_category'] = predicted_categories
+    data['confidence'] = probabilities.max(axis=1)
+    data['skill_match_percentage'] = skill_matches
+    data['matched_skills'] = matched_skills_list
+    data['top_3_recommendations'] = [
+        ' | '.join(f"{class_names[idx]} ({row[idx]:.2%})" for idx in row_top)
+        for row, row_top in zip(probabilities, top_3_idx)
+    ]
+    return pa.Table.from_pandas(data, preserve_index=False)
+
+
+def process_shard(resume_app, lease):
+    """Score a claimed shard and publish its output unless the lease was lost"""
+    shared_dir = lease.shared_dir
+    table = pq.read_table(shared_path(shared_dir, SHARD_DIR, f"{lease.name}.parquet"))
+    result = score_shard(resume_app, table)
+
+    if lease.lost or lease.superseded():
+        print(f"⚠️  Lease on {lease.name} expired mid-shard, discarding attempt {lease.attempt}")
+        return False
+
+    final_path = output_path(shared_dir, lease.name)
+    tmp_path = f"{final_path}.{lease.attempt}.tmp"
+    pq.write_table(result, tmp_path, compression='zstd')
+    os.replace(tmp_path, final_path)
+    return True
+
+
+def run_worker(shared_dir, worker_id=None, lease_seconds=SHARD_LEASE_SECONDS, max_attempts=SHARD_MAX_ATTEMPTS):
+    """Claim and score shards until every shard is done or has failed permanently"""
+    # Importing app loads the trained models; the server warm-up is not needed here
+    os.environ.setdefault('WARMUP_ENABLED', '0')
+    import app as resume_app
+
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    manifest = read_manifest(shared_dir)
+    if manifest['model_version'] != resume_app.MODEL_VERSION:
+        raise RuntimeError(
+            f"Worker model {resume_app.MODEL_VERSION} does not match the partitioned run "
+            f"({manifest['model_version']}); deploy the same model files on every node"
+        )
+
+    scored = 0
+    start = time.perf_counter()
+    # Start at a worker-specific shard to avoid every worker racing for shard 0
+    offset = hash(worker_id) % max(manifest['num_shards'], 1)
+    poll_seconds = min(lease_seconds / 10, 5)
+
+    while True:
+        states = shard_states(shared_dir, manifest, max_attempts, lease_seconds)
+        claimable = [(name, attempt) for name, (state, attempt) in states.items() if state == 'pending']
+        if not claimable:
+            if all(state in ('done', 'failed') for state, _ in states.values()):
+                break
+            # Wait for other workers to finish, or for their leases to expire
+            time.sleep(poll_seconds)
+            continue
+
+        claimable = claimable[offset % len(claimable):] + claimable[:offset % len(claimable)]
+        for name, attempt in claimable:
+            lease = ShardLease.claim(shared_dir, name, attempt, worker_id, lease_seconds)
+            if lease is None:
+                continue
+            shard_start = time.perf_counter()
+            try:
+                with lease:
+                    if process_shard(resume_app, lease):
+                        scored += 1
+                        print(f"[{worker_id}] {name} done in {time.perf_counter() - shard_start:.1f}s "
+                              f"(attempt {attempt})")
+            except Exception as e:
+                with open(shared_path(shared_dir, ERROR_DIR, f"{name}.{attempt}.log"), 'w') as file:
+                    file.write(f"{worker_id}\t{type(e).__name__}: {e}\n")
+                print(f"❌ [{worker_id}] {name} attempt {attempt} failed: {type(e).__name__}: {e}")
+            break
+
+    print(f"✓ [{worker_id}] scored {scored} shards in {time.perf_counter() - start:.1f}s")
+    return scored
+
+
+def print_status(shared_dir, max_attempts=SHARD_MAX_ATTEMPTS):
+    """Print shard counts and any permanently failed shards"""
+    manifest = read_manifest(shared_dir)
+    states = shard_states(shared_dir, manifest, max_attempts)
+    counts = {state: 0 for state in ('done', 'leased', 'pending', 'failed')}
+    for state, _ in states.values():
+        counts[state] += 1
+    print(f"Shards: {manifest['num_shards']}  " + "  ".join(f"{k}: {v}" for k, v in counts.items()))
+    for name, (state, _) in states.items():
+        if state == 'failed':
+            errors = sorted(f for f in os.listdir(shared_path(shared_dir, ERROR_DIR)) if f.startswith(name))
+            last_error = errors[-1] if errors else 'lease expired'
+            print(f"  - {name} failed after {max_attempts} attempts ({last_error})")
+    return counts
+
+
+def merge(shared_dir, merged_path, allow_partial=False):
+    """Concatenate per-shard outputs in input order into one CSV or Parquet file"""
+    manifest = read_manifest(shared_dir)
+    names = [shard_name(index) for index in range(manifest['num_shards'])]
+    missing = [name for name in names if not os.path.exists(output_path(shared_dir, name))]
+    if missing and not allow_partial:
+        raise RuntimeError(f"{len(missing)} shards have no output yet (first: {missing[0]})")
+
+    tables = [pq.read_table(output_path(shared_dir, name)) for name in names if name not in missing]
+    merged = pa.concat_tables(tables).sort_by(ROW_ID_COLUMN).drop_columns([ROW_ID_COLUMN])
+
+    if merged_path.endswith('.parquet'):
+        pq.write_table(merged, merged_path, compression='zstd')
+    else:
+        merged.to_pandas().to_csv(merged_path, index=False)
+    print(f"✓ Merged {merged.num_rows} predictions from {len(tables)} shards into {merged_path}")
+    return merged.num_rows
+
+
+def run_local(input_path, shared_dir, merged_path, workers, shard_size):
+    """Partition, score with local worker processes and merge: the single-node mode"""
+    if not os.path.exists(shared_path(shared_dir, MANIFEST_FILE)):
+        os.environ.setdefault('WARMUP_ENABLED', '0')
+        import app as resume_app
+        partition(input_path, shared_dir, shard_size, resume_app.MODEL_VERSION)
+
+    start = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), 'worker', '--shared', shared_dir])
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.wait()
+    print(f"✓ {workers} workers finished in {time.perf_counter() - start:.1f}s")
+
+    counts = print_status(shared_dir)
+    merge(shared_dir, merged_path, allow_partial=counts['failed'] > 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded batch scoring across processes and nodes")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    partition_parser = commands.add_parser('partition', help="split a corpus into shards")
+    partition_parser.add_argument('input', help="CSV or Parquet file with a resume_text column")
+    partition_parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+
+    worker_parser = commands.add_parser('worker', help="claim and score shards")
+    worker_parser.add_argument('--worker-id', default=None)
+
+    commands.add_parser('status', help="show shard progress")
+
+    merge_parser = commands.add_parser('merge', help="merge per-shard outputs")
+    merge_parser.add_argument('-o', '--output', default='predictions_output.csv')
+    merge_parser.add_argument('--allow-partial', action='store_true')
+
+    run_parser = commands.add_parser('run', help="partition, score with local workers and merge")
+    run_parser.add_argument('input')
+    run_parser.add_argument('-o', '--output', default='predictions_output.csv')
+    run_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1)
+    run_parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+
+    for subparser in commands.choices.values():
+        subparser.add_argument('--shared', required=True, help="shared directory holding shards and leases")
+    args = parser.parse_args(argv)
+
+    if args.command == 'partition':
+        os.environ.setdefault('WARMUP_ENABLED', '0')
+        import app as resume_app
+        partition(args.input, args.shared, args.shard_size, resume_app.MODEL_VERSION)
+    elif args.command == 'worker':
+        run_worker(args.shared, args.worker_id)
+    elif args.command == 'status':
+        print_status(args.shared)
+    elif args.command == 'merge':
+        merge(args.shared, args.output, args.allow_partial)
+    else:
+        run_local(args.input, args.shared, args.output, args.workers, args.shard_size)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
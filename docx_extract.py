@@ -0,0 +1,65 @@
+import re
+import zipfile
+
+from lxml import etree
+
+# WordprocessingML namespaces
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+TEXT_TAG = W_NS + 't'
+TAB_TAG = W_NS + 'tab'
+BREAK_TAGS = {W_NS + 'br', W_NS + 'cr'}
+PARAGRAPH_TAG = W_NS + 'p'
+# Subtrees whose content is not document text: the VML copy of text boxes
+# (already emitted from the DrawingML version) and tab-stop definitions
+SKIPPED_TAGS = {MC_NS + 'Fallback', W_NS + 'tabs'}
+
+DOCUMENT_PART = 'word/document.xml'
+# Only these tags are surfaced to Python; everything else stays in libxml2
+STREAMED_TAGS = [TEXT_TAG, TAB_TAG, PARAGRAPH_TAG, *BREAK_TAGS, *SKIPPED_TAGS]
+
+HEADER_FOOTER_PART = re.compile(r'^word/(header|footer)\d*\.xml$')
+
+
+def iter_part_text(stream):
+    """Yield text runs from one WordprocessingML part without building a tree"""
+    skip_depth = 0
+    for event, elem in etree.iterparse(stream, events=('start', 'end'), tag=STREAMED_TAGS):
+        tag = elem.tag
+
+        if tag in SKIPPED_TAGS:
+            skip_depth += 1 if event == 'start' else -1
+            continue
+        if event == 'start' or skip_depth:
+            continue
+
+        if tag == TEXT_TAG:
+            if elem.text:
+                yield elem.text
+        elif tag == TAB_TAG:
+            yield '\t'
+        elif tag in BREAK_TAGS:
+            yield '\n'
+        elif tag == PARAGRAPH_TAG:
+            yield '\n'
+            # Drop finished paragraphs so memory stays flat on long documents
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def extract_text_from_docx_xml(file_path):
+    """Extract text from body, tables, text boxes, headers and footers of a DOCX file"""
+    chunks = []
+    with zipfile.ZipFile(file_path) as archive:
+        names = archive.namelist()
+        parts = [DOCUMENT_PART] + sorted(name for name in names if HEADER_FOOTER_PART.match(name))
+
+        for part in parts:
+            if part not in names:
+                continue
+            with archive.open(part) as stream:
+                chunks.extend(iter_part_text(stream))
+
+    return "".join(chunks)
@@ -0,0 +1,203 @@
+import os
+import sys
+import socket
+import resource
+import threading
+import subprocess
+from multiprocessing.connection import Connection
+
+from admission import DocumentTooLargeError
+from text_extraction import TEXT_EXTRACTORS
+
+# Sandbox settings (overridable through the environment; 0 workers = extract inline)
+EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', os.cpu_count() or 1))
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', 20))
+EXTRACTION_MEMORY_MB = int(os.environ.get('EXTRACTION_MEMORY_MB', 1024))
+EXTRACTION_MAX_TASKS_PER_CHILD = int(os.environ.get('EXTRACTION_MAX_TASKS_PER_CHILD', 100))
+
+
+class ExtractionError(Exception):
+    """Raised when a document could not be extracted in the sandbox"""
+
+
+class ExtractionTimeoutError(ExtractionError):
+    """Raised when extraction exceeds EXTRACTION_TIMEOUT and the worker is killed"""
+
+
+def worker_main(conn, memory_limit_bytes):
+    """Extraction worker loop: receive (extension, path), send back (status, result)"""
+    if memory_limit_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+    while True:
+        try:
+            file_extension, file_path = conn.recv()
+        except EOFError:
+            return
+
+        try:
+            conn.send(('ok', TEXT_EXTRACTORS[file_extension](file_path)))
+        except MemoryError:
+            # The heap may be in a bad state, report and let the parent replace us
+            conn.send(('memory_error', 'Document exceeded the extraction memory limit'))
+            return
+        except DocumentTooLargeError as e:
+            conn.send(('too_large', str(e)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class ExtractionWorker:
+    """One sandboxed extraction process and its connection
+
+    Workers are fresh interpreters running this file, so they never inherit
+    the server's models, threads or locks and never re-import its main script.
+    """
+
+    def __init__(self, memory_limit_bytes):
+        parent_sock, child_sock = socket.socketpair()
+        with child_sock:
+            self.process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), str(child_sock.fileno()), str(memory_limit_bytes)],
+                pass_fds=[child_sock.fileno()],
+            )
+        self.conn = Connection(parent_sock.detach())
+        self.tasks = 0
+
+    def stop(self):
+        """Kill the process without waiting for the current task"""
+        self.process.kill()
+        self.process.wait()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Recyclable worker processes with per-document timeouts and memory caps
+
+    Workers are spawned lazily up to ``size``. A worker that exceeds the
+    timeout is killed and replaced, and workers are recycled after
+    ``max_tasks_per_child`` documents or a MemoryError.
+    """
+
+    def __init__(self, size, timeout, memory_mb, max_tasks_per_child):
+        self.size = size
+        self.timeout = timeout
+        self.memory_limit_bytes = memory_mb * 1024 * 1024
+        self.max_tasks_per_child = max_tasks_per_child
+        self._cond = threading.Condition()
+        self._idle = []
+        self._workers = 0
+        self._busy = 0
+        self.counters = {
+            'completed': 0,
+            'failed': 0,
+            'too_large': 0,
+            'timeouts': 0,
+            'memory_errors': 0,
+            'crashes': 0,
+            'recycled': 0,
+        }
+
+    def _checkout(self):
+        with self._cond:
+            while not self._idle and self._workers >= self.size:
+                self._cond.wait()
+            self._busy += 1
+            if self._idle:
+                return self._idle.pop()
+            self._workers += 1
+
+        try:
+            return ExtractionWorker(self.memory_limit_bytes)
+        except Exception:
+            with self._cond:
+                self._workers -= 1
+                self._busy -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, worker, healthy):
+        if healthy and worker.tasks >= self.max_tasks_per_child:
+            healthy = False
+            self._count('recycled')
+
+        if not healthy:
+            worker.stop()
+
+        with self._cond:
+            self._busy -= 1
+            if healthy:
+                self._idle.append(worker)
+            else:
+                self._workers -= 1
+            self._cond.notify()
+
+    def _count(self, counter):
+        with self._cond:
+            self.counters[counter] += 1
+
+    def extract(self, file_extension, file_path, count=True):
+        """Extract text from a document in a sandboxed worker
+
+        With count=False (warm-up) the outcome is left out of the counters.
+        """
+        if self.size <= 0:
+            return TEXT_EXTRACTORS[file_extension](file_path)
+
+        record = self._count if count else lambda counter: None
+
+        worker = self._checkout()
+        healthy = False
+        try:
+            try:
+                worker.conn.send((file_extension, os.path.abspath(file_path)))
+                if not worker.conn.poll(self.timeout):
+                    record('timeouts')
+                    raise ExtractionTimeoutError(f"Extraction took longer than {self.timeout:g}s")
+                status, result = worker.conn.recv()
+            except (EOFError, OSError):
+                record('crashes')
+                raise ExtractionError("Extraction worker crashed")
+
+            worker.tasks += 1
+            healthy = status != 'memory_error'
+        finally:
+            self._checkin(worker, healthy)
+
+        if status == 'ok':
+            record('completed')
+            return result
+        if status == 'too_large':
+            record('too_large')
+            raise DocumentTooLargeError(result)
+        record('memory_errors' if status == 'memory_error' else 'failed')
+        raise ExtractionError(result)
+
+    def stats(self):
+        """Snapshot of pool utilization and failure counters"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'workers': self._workers,
+                'busy': self._busy,
+                'idle': len(self._idle),
+                **self.counters,
+            }
+
+    def shutdown(self):
+        """Stop all idle workers"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._workers -= len(idle)
+        for worker in idle:
+            worker.stop()
+
+
+extraction_pool = ExtractionPool(
+    EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB, EXTRACTION_MAX_TASKS_PER_CHILD
+)
+
+
+if __name__ == '__main__':
+    # Entry point for ExtractionWorker processes
+    worker_main(Connection(int(sys.argv[1])), int(sys.argv[2]))
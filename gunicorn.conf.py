@@ -0,0 +1,10 @@
+# Gunicorn settings for the Flask app (python build_static.py && gunicorn app:app -c gunicorn.conf.py)
+from admission import ADMISSION_QUEUE_SIZE, MAX_CONCURRENT_PREDICTIONS
+
+# Admission control only works if one worker process serves requests
+# concurrently: a sync worker handles one at a time, so its wait queue
+# never forms and overload piles up in the listen backlog instead of
+# getting a 503. Give each worker a thread for every running and queued
+# request, plus one to answer the requests that must be rejected.
+worker_class = 'gthread'
+threads = MAX_CONCURRENT_PREDICTIONS + ADMISSION_QUEUE_SIZE + 1
@@ -1,4 +1,5 @@
 import os
+import time
 import pandas as pd
 import numpy as np
 import joblib
@@ -12,11 +13,25 @@ from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from data_ingest import load_training_corpus
+from cascade import (
+    TARGET_AGREEMENT, REPORT_TARGETS, train_first_stage, first_stage_scores,
+    keyword_support, accept_first_stage, set_target_agreement,
+)
+
 # File paths
 MODEL_FILE = "logistic_model.pkl"
 VECTORIZER_FILE = "tfidf_vectorizer.pkl"
 ENCODER_FILE = "label_encoder.pkl"
-DATA_FILE = "Resume.csv"
+FAST_MODEL_FILE = "fast_model.pkl"
+CORPUS_FILE = "training_corpus.parquet"
+
+# Labeled training sources (CSV or Parquet) with their column mapping
+# (source column -> standard column)
+DATA_SOURCES = [
+    {'path': 'UpdatedResumeDataSet.csv', 'columns': {'Resume': 'resume_text', 'Category': 'category'}},
+    {'path': 'Resume.csv', 'columns': {'resume_text': 'resume_text', 'category': 'category'}},
+]
 
 # Allowed categories
 ALLOWED_CATEGORIES = [
@@ -86,6 +101,9 @@ JOB_SKILLS = {
     'CONSULTANT': ['consulting', 'business analysis', 'strategy', 'project management', 'client management'],
 }
 
+# Required skills per role as sets (used by the cascade keyword check)
+SKILL_SETS = {role: frozenset(skills) for role, skills in JOB_SKILLS.items()}
+
 def extract_skills(text):
     """Extract skills from resume text"""
     text_lower = text.lower()
@@ -134,24 +152,101 @@ def clean_text(text):
     return " ".join(words)
 
 
-def load_and_prepare_data(file_path):
+def load_and_prepare_data(sources):
     """Load and prepare resume data"""
-    print(f"Loading data from {file_path}...")
-    df = pd.read_csv(file_path)
+    # Only the text/label columns of allowed categories are read
+    df = load_training_corpus(sources, ALLOWED_CATEGORIES, CORPUS_FILE)
     
     print("Cleaning resume text...")
     df['cleaned_resume'] = df['resume_text'].apply(clean_text)
     
     # Create working dataframe
-    df2 = pd.DataFrame(df, columns=["category", "cleaned_resume"])
-    
-    # Filter allowed categories
-    df2 = df2[df2['category'].isin(ALLOWED_CATEGORIES)].copy()
+    df2 = df[["category", "cleaned_resume"]]
     
     print(f"Data prepared: {len(df2)} records, {df2['category'].nunique()} unique categories")
     return df2
 
 
+def build_cascade_stage(cleaned_texts, vectorizer, model, label_encoder):
+    """Train the cascade first stage and calibrate its margin against the full model"""
+    # Distill: the first stage learns to reproduce the full model's predictions
+    full_predictions = model.predict(vectorizer.transform(cleaned_texts))
+    texts_train, texts_cal, y_train, full_pred = train_test_split(
+        list(cleaned_texts), full_predictions, test_size=0.2, random_state=42
+    )
+    
+    print("\nTraining cascade first stage (unigram TF-IDF + Logistic Regression)...")
+    fast_vectorizer, fast_model = train_first_stage(texts_train, y_train)
+    stage = {'vectorizer': fast_vectorizer, 'model': fast_model}
+    
+    # Calibrate on held-out resumes: how often does the first stage agree with the full model?
+    fast_probabilities, margin = first_stage_scores(stage, texts_cal, len(label_encoder.classes_))
+    fast_top = fast_probabilities.argmax(axis=1)
+    support = keyword_support(fast_top, [set(extract_skills(t)) for t in texts_cal], label_encoder.classes_, SKILL_SETS)
+    # Kept with the stage so the agreement target can be changed without retraining
+    stage['calibration'] = (margin, support, fast_top == full_pred)
+    set_target_agreement(stage, TARGET_AGREEMENT)
+    
+    accepted = accept_first_stage(stage, margin, support)
+    print(f"Margin threshold for {TARGET_AGREEMENT:.0%} agreement: {stage['margin_threshold']:.2f}")
+    print(f"Calibration set answered by first stage: {accepted.mean():.2%}")
+    return stage
+
+
+def best_time(run, repeat=3):
+    """Fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report_cascade(stage, texts, full_predictions, actual=None):
+    """Report escalation rate, agreement, accuracy and speed of the cascade at several agreement targets"""
+    print("\n" + "=" * 80)
+    print("Cascaded Inference:")
+    print("=" * 80)
+    
+    texts = list(texts)
+    n_classes = len(label_encoder.classes_)
+    resume_skills_list = [set(extract_skills(t)) for t in texts]
+    full_seconds = best_time(lambda: model.predict_proba(tfidf_vectorizer.transform(texts)))
+    if actual is not None:
+        full_accuracy = accuracy_score(actual, label_encoder.inverse_transform(full_predictions))
+    
+    def run_cascade():
+        # Resumes the first stage answers never go through the full vectorizer
+        fast_probabilities, margin = first_stage_scores(stage, texts, n_classes)
+        fast_top = fast_probabilities.argmax(axis=1)
+        support = keyword_support(fast_top, resume_skills_list, label_encoder.classes_, SKILL_SETS)
+        escalated = np.flatnonzero(~accept_first_stage(stage, margin, support))
+        predictions = fast_top.copy()
+        if len(escalated):
+            predictions[escalated] = model.predict(tfidf_vectorizer.transform([texts[i] for i in escalated]))
+        return predictions, escalated
+    
+    print(f"Resumes evaluated: {len(texts)}, full model: {full_seconds * 1000:.1f} ms")
+    if actual is not None:
+        print(f"Full model accuracy: {full_accuracy:.4f}")
+    print(f"{'target':>8} {'threshold':>10} {'escalated':>10} {'agreement':>10} {'acc. delta':>11} {'speed':>7}")
+    for target in sorted(set(REPORT_TARGETS) | {TARGET_AGREEMENT}):
+        set_target_agreement(stage, target)
+        cascade_predictions, escalated = run_cascade()
+        cascade_seconds = best_time(run_cascade)
+        delta = ''
+        if actual is not None:
+            cascade_accuracy = accuracy_score(actual, label_encoder.inverse_transform(cascade_predictions))
+            delta = f"{cascade_accuracy - full_accuracy:+.4f}"
+        print(f"{target:>8.0%} {stage['margin_threshold']:>10.2f} {len(escalated) / len(texts):>10.2%} "
+              f"{(cascade_predictions == full_predictions).mean():>10.2%} {delta:>11} "
+              f"{full_seconds / cascade_seconds:>6.2f}x")
+    set_target_agreement(stage, TARGET_AGREEMENT)
+    print("Speed is relative to the full model; the web app uses CASCADE_TARGET_AGREEMENT "
+          f"(default {TARGET_AGREEMENT:.0%})")
+
+
 if not os.path.exists(MODEL_FILE):
     # TRAINING PHASE
     print("=" * 60)
@@ -162,7 +257,7 @@ if not os.path.exists(MODEL_FILE):
     download_nltk_data()
     
     # Load and prepare data
-    df = load_and_prepare_data(DATA_FILE)
+    df = load_and_prepare_data(DATA_SOURCES)
     
     # Encode categories
     print("\nEncoding categories...")
@@ -238,6 +333,10 @@ if not os.path.exists(MODEL_FILE):
     joblib.dump(label_encoder, ENCODER_FILE)
     print(f"✓ Label Encoder saved to: {ENCODER_FILE}")
     
+    cascade_stage = build_cascade_stage(df.loc[y_train.index, 'cleaned_resume'], tfidf_vectorizer, model, label_encoder)
+    joblib.dump(cascade_stage, FAST_MODEL_FILE)
+    print(f"✓ Cascade first stage saved to: {FAST_MODEL_FILE}")
+    
     # Save test data for inference testing
     test_indices = y_test.index
     test_df = pd.DataFrame({
@@ -269,6 +368,37 @@ else:
     print(f"✓ Vectorizer loaded from: {VECTORIZER_FILE}")
     print(f"✓ Label Encoder loaded from: {ENCODER_FILE}")
     
+    # Load (or train, for models predating the cascade) the cascade first stage
+    cascade_stage = None
+    distilled_rows = None
+    if os.path.exists(FAST_MODEL_FILE):
+        cascade_stage = joblib.load(FAST_MODEL_FILE)
+        print(f"✓ Cascade first stage loaded from: {FAST_MODEL_FILE}")
+    if cascade_stage is not None and 'vectorizer' not in cascade_stage:
+        # Built by an older version that reused the full model's features
+        print(f"⚠️  Rebuilding outdated cascade first stage in {FAST_MODEL_FILE}")
+        cascade_stage = None
+    if cascade_stage is None:
+        # Distillation needs no labels, only text from the full model's domain:
+        # use the first half of test_input.csv and keep the second half held out
+        if os.path.exists("test_input.csv"):
+            distill_texts = pd.read_csv("test_input.csv")['resume_text'].apply(clean_text)
+            distilled_rows = [0, len(distill_texts) // 2]
+            distill_texts = distill_texts.iloc[distilled_rows[0]:distilled_rows[1]]
+        else:
+            try:
+                distill_texts = load_and_prepare_data(DATA_SOURCES)['cleaned_resume']
+            except FileNotFoundError as e:
+                distill_texts = None
+                print(f"⚠️  Skipping cascade first stage: {e}")
+        
+        if distill_texts is not None:
+            cascade_stage = build_cascade_stage(distill_texts, tfidf_vectorizer, model, label_encoder)
+            # Remembered so every later run scores the cascade only on rows it never saw
+            cascade_stage['distilled_rows'] = distilled_rows
+            joblib.dump(cascade_stage, FAST_MODEL_FILE)
+            print(f"✓ Cascade first stage saved to: {FAST_MODEL_FILE}")
+    
     # Check if test input file exists
     if os.path.exists("test_input.csv"):
         print(f"\nLoading test data from: test_input.csv")
@@ -319,6 +449,19 @@ else:
         
         input_data['top_3_recommendations'] = top_3_predictions
         
+        if cascade_stage is not None:
+            # Only score rows the first stage was not distilled from
+            held_out = np.ones(len(input_data), dtype=bool)
+            if cascade_stage.get('distilled_rows'):
+                start_row, stop_row = cascade_stage['distilled_rows']
+                held_out[start_row:stop_row] = False
+            report_cascade(
+                cascade_stage,
+                input_data['cleaned_resume'].iloc[held_out],
+                predictions[held_out],
+                input_data['actual_category'].iloc[held_out] if 'actual_category' in input_data.columns else None,
+            )
+        
         # Calculate accuracy if actual categories are available
         if 'actual_category' in input_data.columns:
             accuracy = accuracy_score(input_data['actual_category'], predicted_categories)
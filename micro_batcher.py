@@ -0,0 +1,138 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+# Micro-batching settings (overridable through the environment; off by default)
+MICRO_BATCH_ENABLED = os.environ.get('MICRO_BATCH_ENABLED', '0') == '1'
+MICRO_BATCH_MAX_SIZE = max(1, int(os.environ.get('MICRO_BATCH_MAX_SIZE', 32)))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', 2))
+
+
+def histogram_percentile(histogram, total, fraction):
+    """Value at ``fraction`` of a {value: count} histogram sorted by value"""
+    rank = int(total * fraction)
+    seen = 0
+    for value, count in histogram.items():
+        seen += count
+        if seen > rank:
+            return value
+    return 0
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row inference calls into batched calls
+
+    Callers submit one item and block on a future. A dedicated thread takes
+    the first waiting item and collects the other submitted requests, up to
+    ``max_batch_size`` items, waiting at most ``max_wait_ms`` for ones still
+    being queued. It then calls ``predict_batch`` once on the whole batch and
+    hands each caller its own row. A request with nothing else in flight is
+    dispatched at once, so serial traffic pays no added latency; batches form
+    from requests that arrive while the previous batch is running.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=MICRO_BATCH_MAX_SIZE, max_wait_ms=MICRO_BATCH_MAX_WAIT_MS):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._in_flight = 0
+        self.batch_sizes = {}
+        self.counters = {'batches': 0, 'requests': 0, 'errors': 0, 'queue_wait_ms': 0.0, 'inference_ms': 0.0}
+
+    def _ensure_started(self):
+        # Threads do not survive fork: a forked child starts its own inference thread
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.SimpleQueue()
+            self._in_flight = 0
+            thread = threading.Thread(target=self._run, args=(self._queue,), name='micro-batcher', daemon=True)
+            thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, item):
+        """Queue one item and return a Future resolved with its row of the batch result"""
+        self._ensure_started()
+        future = Future()
+        with self._lock:
+            self._in_flight += 1
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def predict(self, item):
+        """Blocking single-item inference through the shared batch"""
+        return self.submit(item).result()
+
+    def _collect(self, pending):
+        batch = [pending.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            with self._lock:
+                # Only wait for requests already submitted, never for ones that may come
+                if len(batch) >= self._in_flight:
+                    break
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, pending):
+        while True:
+            batch = self._collect(pending)
+            started = time.perf_counter()
+            error = rows = None
+            try:
+                rows = self.predict_batch([item for item, _, _ in batch])
+            except Exception as e:
+                error = e
+            finished = time.perf_counter()
+
+            size = len(batch)
+            with self._lock:
+                # Before resolving, so a caller that resubmits at once is not counted twice
+                self._in_flight -= size
+            for index, (_, future, _) in enumerate(batch):
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(rows[index])
+
+            with self._lock:
+                self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
+                self.counters['batches'] += 1
+                self.counters['requests'] += size
+                self.counters['errors'] += size if error is not None else 0
+                self.counters['queue_wait_ms'] += sum(started - queued for _, _, queued in batch) * 1000
+                self.counters['inference_ms'] += (finished - started) * 1000
+
+    def stats(self):
+        """Batch-size distribution and average queueing/inference time per request"""
+        with self._lock:
+            counters = dict(self.counters)
+            sizes = dict(sorted(self.batch_sizes.items()))
+
+        requests = counters['requests']
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': counters['batches'],
+            'requests': requests,
+            'errors': counters['errors'],
+            'mean_batch_size': round(requests / counters['batches'], 2) if counters['batches'] else 0,
+            'p50_batch_size': histogram_percentile(sizes, counters['batches'], 0.50),
+            'p95_batch_size': histogram_percentile(sizes, counters['batches'], 0.95),
+            'mean_queue_wait_ms': round(counters['queue_wait_ms'] / requests, 3) if requests else 0,
+            'mean_batch_inference_ms': round(counters['inference_ms'] / counters['batches'], 3) if counters['batches'] else 0,
+            'batch_size_histogram': sizes,
+        }
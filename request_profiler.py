@@ -0,0 +1,108 @@
+import os
+import hmac
+import json
+import time
+import uuid
+import random
+import shutil
+import cProfile
+import contextvars
+
+# Profiling settings (overridable through the environment; off by default)
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+# Profiles capture uploaded resumes, so profiling is refused without a token
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1' and bool(PROFILE_TOKEN)
+if os.environ.get('PROFILING_ENABLED', '0') == '1' and not PROFILE_TOKEN:
+    print("⚠️  Profiling disabled: set PROFILE_TOKEN to enable it")
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_MAX_ENTRIES = max(1, int(os.environ.get('PROFILE_MAX_ENTRIES', 50)))
+PROFILE_HEADER = 'X-Profile-Request'
+
+PROFILE_FILE = 'profile.prof'
+META_FILE = 'meta.json'
+
+# Directory of the profile being recorded for the current request, if any
+current_entry = contextvars.ContextVar('profile_entry', default=None)
+
+
+def token_matches(value):
+    """True if a PROFILE_TOKEN is configured and value equals it"""
+    return bool(PROFILE_TOKEN) and hmac.compare_digest(value or '', PROFILE_TOKEN)
+
+
+def should_profile(header_value):
+    """Decide whether to profile a request from its header and the sampling rate"""
+    if not PROFILING_ENABLED:
+        return False
+    if header_value and token_matches(header_value):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def run_profiled(func, label):
+    """Run func under cProfile and record it in the on-disk profile ring"""
+    entry_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    entry_dir = os.path.join(PROFILE_DIR, entry_id)
+    os.makedirs(entry_dir, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    token = current_entry.set(entry_dir)
+    start = time.perf_counter()
+    result = None
+    try:
+        result = profiler.runcall(func)
+        return result
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        current_entry.reset(token)
+        profiler.dump_stats(os.path.join(entry_dir, PROFILE_FILE))
+        files = sorted(os.listdir(entry_dir) + [META_FILE])
+        with open(os.path.join(entry_dir, META_FILE), 'w') as file:
+            json.dump({
+                'id': entry_id,
+                'label': label,
+                'timestamp': time.time(),
+                'elapsed_ms': round(elapsed_ms, 2),
+                'status': getattr(result, 'status_code', None),
+                'files': files,
+            }, file, indent=2)
+        prune_profiles()
+
+
+def capture_input(file_path, original_name=None):
+    """Copy a request's input file into the profile being recorded, if any"""
+    entry_dir = current_entry.get()
+    if entry_dir is None:
+        return
+    extension = os.path.splitext(original_name or file_path)[1]
+    shutil.copyfile(file_path, os.path.join(entry_dir, f"input{extension}"))
+
+
+def prune_profiles():
+    """Keep only the newest PROFILE_MAX_ENTRIES profiles"""
+    entries = sorted(os.listdir(PROFILE_DIR))
+    for entry_id in entries[:-PROFILE_MAX_ENTRIES]:
+        shutil.rmtree(os.path.join(PROFILE_DIR, entry_id), ignore_errors=True)
+
+
+def profile_exists(entry_id):
+    """True if entry_id names a recorded profile"""
+    return os.path.isdir(PROFILE_DIR) and entry_id in os.listdir(PROFILE_DIR)
+
+
+def list_profiles():
+    """Metadata of recorded profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+
+    profiles = []
+    for entry_id in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        meta_path = os.path.join(PROFILE_DIR, entry_id, META_FILE)
+        try:
+            with open(meta_path, 'r') as file:
+                profiles.append(json.load(file))
+        except (OSError, ValueError):
+            # Profile still being written or removed by the pruner
+            continue
+    return profiles
@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+import contextlib
+
+# Local stand-in for the candidate database (overridable through the environment)
+RESUME_STORE_ENABLED = os.environ.get('RESUME_STORE_ENABLED', '0') == '1'
+RESUME_STORE_PATH = os.environ.get('RESUME_STORE_PATH', 'resume_store.db')
+# How long a request waits for another writer before giving up on storing
+RESUME_STORE_TIMEOUT = float(os.environ.get('RESUME_STORE_TIMEOUT', 5))
+RESCORE_BATCH_SIZE = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    content_hash TEXT PRIMARY KEY,
+    filename TEXT,
+    extracted_text TEXT NOT NULL,
+    cleaned_text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    content_hash TEXT NOT NULL REFERENCES resumes(content_hash),
+    model_version TEXT NOT NULL,
+    primary_role TEXT NOT NULL,
+    primary_confidence REAL NOT NULL,
+    recommendations TEXT NOT NULL,
+    scored_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, model_version)
+);
+"""
+
+
+def file_content_hash(file_path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_model_version(*paths):
+    """Short content hash identifying a set of model files"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+# Per-thread connections used on the request path
+_local = threading.local()
+
+
+def open_store(path=None, timeout=30):
+    """Open a connection to the store, creating the schema on first use"""
+    conn = sqlite3.connect(path or RESUME_STORE_PATH, timeout=timeout)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextlib.contextmanager
+def connect(path=None):
+    """Short-lived connection for maintenance commands"""
+    conn = open_store(path)
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def thread_connection(path=None):
+    """This thread's long-lived connection, opened once per thread and process"""
+    path = path or RESUME_STORE_PATH
+    key = (os.getpid(), path)
+    if getattr(_local, 'key', None) != key:
+        # A connection inherited across fork must not be reused
+        _local.conn = open_store(path, timeout=RESUME_STORE_TIMEOUT)
+        _local.key = key
+    return _local.conn
+
+
+def prediction_row(content_hash, model_version, response):
+    """Flatten a /predict response into a predictions row"""
+    recommendations = [
+        {key: rec[key] for key in ('role', 'confidence', 'skill_match', 'matched_skills')}
+        for rec in response['recommendations']
+    ]
+    return (
+        content_hash,
+        model_version,
+        str(response['primary_role']),
+        float(response['primary_confidence']),
+        json.dumps(recommendations, default=str),
+        time.time(),
+    )
+
+
+def save_processed_resume(content_hash, filename, extracted_text, cleaned_text, skills,
+                          model_version, response, path=None):
+    """Persist one processed resume and its prediction for model_version"""
+    conn = thread_connection(path)
+    # The connection's context manager commits, or rolls back on error
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO resumes VALUES (?, ?, ?, ?, ?, ?)",
+            (content_hash, filename, extracted_text, cleaned_text, json.dumps(skills), time.time()),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)",
+            prediction_row(content_hash, model_version, response),
+        )
+
+
+def store_stats(model_version, path=None):
+    """Number of stored resumes and how many lack a prediction for model_version"""
+    with connect(path) as conn:
+        total = conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+        current = conn.execute(
+            "SELECT COUNT(*) FROM predictions WHERE model_version = ?", (model_version,)
+        ).fetchone()[0]
+    return {'resumes': total, 'current': current, 'stale': total - current}
+
+
+def rescore_stale(resume_app, batch_size=RESCORE_BATCH_SIZE, path=None):
+    """Re-run vectorize/predict/skill-match for resumes lacking a current prediction
+
+    Extraction and cleaning are skipped: the stored cleaned text and skills
+    are fed to the model in large batches.
+    """
+    model_version = resume_app.MODEL_VERSION
+    stats = store_stats(model_version, path)
+    print(f"Model version: {model_version}")
+    print(f"Stored resumes: {stats['resumes']}, stale: {stats['stale']}")
+
+    scored = 0
+    start = time.perf_counter()
+    with connect(path) as read_conn, connect(path) as write_conn:
+        cursor = read_conn.execute(
+            """
+            SELECT r.content_hash, r.cleaned_text, r.skills FROM resumes r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM predictions p
+                WHERE p.content_hash = r.content_hash AND p.model_version = ?
+            )
+            """,
+            (model_version,),
+        )
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+
+            features = resume_app.tfidf_vectorizer.transform([row[1] for row in batch])
+            probabilities = resume_app.model.predict_proba(features)
+
+            rows = []
+            for (content_hash, _, skills), row_probabilities in zip(batch, probabilities):
+                response = resume_app.build_prediction_response(json.loads(skills), row_probabilities)
+                rows.append(prediction_row(content_hash, model_version, response))
+
+            write_conn.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)", rows)
+            write_conn.commit()
+
+            scored += len(batch)
+            elapsed = time.perf_counter() - start
+            print(f"  - {scored}/{stats['stale']} rescored ({scored / elapsed:.0f} resumes/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Rescored {scored} resumes in {elapsed:.1f}s")
+    return scored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Processed-resume store maintenance")
+    parser.add_argument('command', choices=['rescore', 'stats'])
+    parser.add_argument('--db', default=RESUME_STORE_PATH, help="store path (default: %(default)s)")
+    parser.add_argument('--batch-size', type=int, default=RESCORE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    # Importing app loads the current models; the server warm-up is not needed here
+    os.environ.setdefault('WARMUP_ENABLED', '0')
+    import app as resume_app
+
+    if args.command == 'stats':
+        print(json.dumps(store_stats(resume_app.MODEL_VERSION, args.db), indent=2))
+    else:
+        rescore_stale(resume_app, args.batch_size, args.db)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
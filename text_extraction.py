@@ -0,0 +1,35 @@
+import PyPDF2
+
+from admission import MAX_PDF_PAGES, DocumentTooLargeError
+from docx_extract import extract_text_from_docx_xml
+
+
+def extract_text_from_pdf(file_path):
+    """Extract text from PDF file"""
+    text = ""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        if len(pdf_reader.pages) > MAX_PDF_PAGES:
+            raise DocumentTooLargeError(f"PDF has {len(pdf_reader.pages)} pages (limit {MAX_PDF_PAGES})")
+        for page in pdf_reader.pages:
+            text += page.extract_text()
+    return text
+
+
+def extract_text_from_docx(file_path):
+    """Extract text from DOCX file (body, tables, text boxes, headers and footers)"""
+    return extract_text_from_docx_xml(file_path)
+
+
+def extract_text_from_txt(file_path):
+    """Extract text from TXT file"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
+        return file.read()
+
+
+# Text extractor for each supported upload extension
+TEXT_EXTRACTORS = {
+    'pdf': extract_text_from_pdf,
+    'docx': extract_text_from_docx,
+    'txt': extract_text_from_txt,
+}
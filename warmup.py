@@ -0,0 +1,97 @@
+import os
+import time
+import threading
+
+# Warm-up settings (overridable through the environment)
+WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', '1') == '1'
+WARMUP_ROUNDS = max(1, int(os.environ.get('WARMUP_ROUNDS', 2)))
+WARMUP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'warmup')
+
+# Canned resumes covering every extractor
+WARMUP_FILES = ['sample_resume.pdf', 'sample_resume.docx', 'sample_resume.txt']
+
+
+class WarmupState:
+    """Progress and timings of the startup warm-up, read by /ready"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ready = False
+        self.started_at = None
+        self.finished_at = None
+        self.timings_ms = {}
+        self.errors = {}
+
+    def run(self, run_one, rounds=WARMUP_ROUNDS):
+        """Run each canned resume through run_one(file_path, extension) ``rounds`` times
+
+        run_one returns the HTTP status of the pipeline. Failures are recorded
+        but do not block readiness: a broken sample must not take the fleet out.
+        """
+        with self._lock:
+            self.started_at = time.time()
+
+        print("Warming up prediction pipeline...")
+        for _ in range(rounds):
+            for name in WARMUP_FILES:
+                file_path = os.path.join(WARMUP_DIR, name)
+                extension = name.rsplit('.', 1)[1]
+                start = time.perf_counter()
+                try:
+                    status = run_one(file_path, extension)
+                    if status != 200:
+                        raise RuntimeError(f"pipeline returned status {status}")
+                except Exception as e:
+                    with self._lock:
+                        self.errors[name] = f"{type(e).__name__}: {e}"
+                    continue
+                elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+                with self._lock:
+                    self.timings_ms.setdefault(name, []).append(elapsed_ms)
+
+        with self._lock:
+            self.finished_at = time.time()
+            self.ready = True
+            total_s = self.finished_at - self.started_at
+
+        for name, timings in self.timings_ms.items():
+            print(f"  - {name}: " + ", ".join(f"{t:.0f}ms" for t in timings))
+        for name, error in self.errors.items():
+            print(f"⚠️  Warm-up failed for {name}: {error}")
+        print(f"✓ Warm-up complete in {total_s:.1f}s")
+
+    def start(self, run_one, after=None):
+        """Run the warm-up in a background thread, or mark ready at once if disabled
+
+        If ``after`` is a thread, the warm-up waits for it to finish first.
+        """
+        if not WARMUP_ENABLED:
+            with self._lock:
+                self.ready = True
+            return None
+
+        def target():
+            if after is not None:
+                after.join()
+            self.run(run_one)
+
+        thread = threading.Thread(target=target, name='warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def status(self):
+        """Snapshot for the /ready endpoint"""
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'enabled': WARMUP_ENABLED,
+                'duration_s': (
+                    round(self.finished_at - self.started_at, 3)
+                    if self.finished_at is not None else None
+                ),
+                'timings_ms': {name: list(timings) for name, timings in self.timings_ms.items()},
+                'errors': dict(self.errors),
+            }
+
+
+warmup_state = WarmupState()